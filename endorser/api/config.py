@@ -105,6 +105,16 @@ class GlobalConfig(BaseSettings):
         ACAPY_WEBHOOK_URL_API_KEY_NAME (str): Header name for API key in webhook URL.
         ACAPY_WEBHOOK_URL_API_KEY (str): API key for the ACAPY webhook URL.
         DB_ECHO_LOG (bool): Flag to enable SQLAlchemy echo.
+        DB_POOL_SIZE (int): Connections kept open in the database pool.
+        DB_MAX_OVERFLOW (int): Connections opened beyond the pool size under load.
+        DB_POOL_TIMEOUT (int): Seconds to wait for a free pooled connection.
+        DB_POOL_RECYCLE (int): Seconds after which a pooled connection is replaced.
+        DB_POOL_PRE_PING (bool): Check that a pooled connection is alive on checkout.
+        DB_NULL_POOL (bool): Open a connection per session instead of pooling, and
+                             disable prepared statement caches, for use behind a
+                             transaction-pooling pgbouncer.
+        DB_INSERTMANYVALUES_PAGE_SIZE (int): Rows per multi-row INSERT statement
+                                             when executing many rows.
         API_V1_STR (str): API version 1 prefix.
         JWT_SECRET_KEY (str): Secret key for JWT encoding.
         JWT_ALGORITHM (str): Algorithm used for JWT.
@@ -177,6 +187,19 @@ class GlobalConfig(BaseSettings):
     ACAPY_WEBHOOK_URL_API_KEY: str = os.environ.get("ACAPY_WEBHOOK_URL_API_KEY", "")
 
     DB_ECHO_LOG: bool = False
+    DB_POOL_SIZE: int = os.environ.get("CONTROLLER_POSTGRESQL_POOL_SIZE", 20)
+    DB_MAX_OVERFLOW: int = os.environ.get("CONTROLLER_POSTGRESQL_MAX_OVERFLOW", 10)
+    DB_POOL_TIMEOUT: int = os.environ.get("CONTROLLER_POSTGRESQL_POOL_TIMEOUT", 5)
+    DB_POOL_RECYCLE: int = os.environ.get("CONTROLLER_POSTGRESQL_POOL_RECYCLE", 1800)
+    DB_POOL_PRE_PING: bool = to_bool(
+        os.environ.get("CONTROLLER_POSTGRESQL_POOL_PRE_PING", "true")
+    )
+    DB_NULL_POOL: bool = to_bool(
+        os.environ.get("CONTROLLER_POSTGRESQL_NULL_POOL", "false")
+    )
+    DB_INSERTMANYVALUES_PAGE_SIZE: int = os.environ.get(
+        "CONTROLLER_POSTGRESQL_INSERTMANYVALUES_PAGE_SIZE", 10_000
+    )
 
     # Api V1 prefix
     API_V1_STR: str = "/v1"
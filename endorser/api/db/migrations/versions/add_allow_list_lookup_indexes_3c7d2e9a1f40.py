@@ -0,0 +1,36 @@
+"""Add lookup indexes for the allow list filters
+
+Revision ID: 3c7d2e9a1f40
+Revises: z92seb39481z
+Create Date: 2026-10-15 10:12:41.502113
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7d2e9a1f40'
+down_revision = 'z92seb39481z'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_allowedschema_lookup',
+        'allowedschema',
+        ['author_did', 'schema_name', 'version'],
+    )
+    op.create_index(
+        'ix_allowedcredentialdefinition_lookup',
+        'allowedcredentialdefinition',
+        ['schema_issuer_did', 'creddef_author_did', 'schema_name', 'tag', 'version'],
+    )
+
+
+def downgrade():
+    op.drop_index(
+        'ix_allowedcredentialdefinition_lookup',
+        table_name='allowedcredentialdefinition',
+    )
+    op.drop_index('ix_allowedschema_lookup', table_name='allowedschema')
@@ -0,0 +1,61 @@
+"""Track a write version per allow list table
+
+Revision ID: 5f0a9d3b6c18
+Revises: 8e21b4c7d905
+Create Date: 2026-10-15 15:26:09.874312
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f0a9d3b6c18'
+down_revision = '8e21b4c7d905'
+branch_labels = None
+depends_on = None
+
+ALLOW_LIST_TABLES = (
+    'allowedpublicdid',
+    'allowedschema',
+    'allowedcredentialdefinition',
+    'allowedlogentry',
+)
+
+
+def upgrade():
+    op.create_table(
+        'allowlistversion',
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+    op.execute(
+        """
+        CREATE FUNCTION bump_allow_list_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE allowlistversion SET version = version + 1
+            WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in ALLOW_LIST_TABLES:
+        op.execute(
+            f"INSERT INTO allowlistversion (table_name, version) VALUES ('{table}', 0)"
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_allow_list_version()
+            """
+        )
+
+
+def downgrade():
+    for table in ALLOW_LIST_TABLES:
+        op.execute(f"DROP TRIGGER {table}_version ON {table}")
+    op.execute("DROP FUNCTION bump_allow_list_version()")
+    op.drop_table('allowlistversion')
@@ -0,0 +1,33 @@
+"""Add lookup indexes for log entries and endorse requests
+
+Revision ID: 8e21b4c7d905
+Revises: 3c7d2e9a1f40
+Create Date: 2026-10-15 14:03:27.118540
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8e21b4c7d905'
+down_revision = '3c7d2e9a1f40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_allowedlogentry_lookup',
+        'allowedlogentry',
+        ['scid', 'domain', 'namespace', 'identifier'],
+    )
+    op.create_index('ix_endorserequest_state', 'endorserequest', ['state'])
+    op.create_index(
+        'ix_endorserequest_transaction_id', 'endorserequest', ['transaction_id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_endorserequest_transaction_id', table_name='endorserequest')
+    op.drop_index('ix_endorserequest_state', table_name='endorserequest')
+    op.drop_index('ix_allowedlogentry_lookup', table_name='allowedlogentry')
@@ -0,0 +1,81 @@
+"""Bump allow list write versions once per transaction, at commit
+
+Revision ID: c27e4b9d1a56
+Revises: 5f0a9d3b6c18
+Create Date: 2026-10-15 18:02:41.517903
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c27e4b9d1a56'
+down_revision = '5f0a9d3b6c18'
+branch_labels = None
+depends_on = None
+
+ALLOW_LIST_TABLES = (
+    'allowedpublicdid',
+    'allowedschema',
+    'allowedcredentialdefinition',
+    'allowedlogentry',
+)
+
+
+def upgrade():
+    # The statement trigger updated the table's version row as soon as a write
+    # ran, so the row stayed locked until that transaction ended and every other
+    # writer to the table queued behind it. Deferred to commit, the row is only
+    # locked for the commit itself. Constraint triggers are row-level, so only
+    # the first row of each table per transaction bumps the version.
+    op.execute(
+        """
+        CREATE FUNCTION bump_allow_list_version_once() RETURNS trigger AS $$
+        DECLARE
+            marker text;
+        BEGIN
+            marker := 'allow_list_version.bumped_' || TG_TABLE_NAME;
+            IF current_setting(marker, true) IS DISTINCT FROM txid_current()::text
+            THEN
+                PERFORM set_config(marker, txid_current()::text, true);
+                UPDATE allowlistversion SET version = version + 1
+                WHERE table_name = TG_TABLE_NAME;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in ALLOW_LIST_TABLES:
+        op.execute(f"DROP TRIGGER {table}_version ON {table}")
+        op.execute(
+            f"""
+            CREATE CONSTRAINT TRIGGER {table}_version
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            DEFERRABLE INITIALLY DEFERRED
+            FOR EACH ROW EXECUTE FUNCTION bump_allow_list_version_once()
+            """
+        )
+        # TRUNCATE cannot fire constraint triggers; it holds an exclusive lock on
+        # the table until commit anyway, so bumping straight away blocks no one
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_truncate_version
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_allow_list_version()
+            """
+        )
+
+
+def downgrade():
+    for table in ALLOW_LIST_TABLES:
+        op.execute(f"DROP TRIGGER {table}_truncate_version ON {table}")
+        op.execute(f"DROP TRIGGER {table}_version ON {table}")
+        op.execute(
+            f"""
+            CREATE TRIGGER {table}_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_allow_list_version()
+            """
+        )
+    op.execute("DROP FUNCTION bump_allow_list_version_once()")
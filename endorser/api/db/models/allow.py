@@ -6,9 +6,10 @@ Models of the Endorser tables for allow list and related data.
 
 import uuid
 from datetime import datetime
+from operator import itemgetter
 
 from sqlmodel import Field
-from sqlalchemy import Column, func
+from sqlalchemy import BigInteger, Column, Index, func
 from sqlalchemy.engine.default import DefaultExecutionContext
 from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP
 
@@ -43,6 +44,35 @@ class AllowedPublicDid(BaseModel, table=True):
     )
 
 
+ALLOWED_SCHEMA_KEY = ("author_did", "schema_name", "version")
+ALLOWED_LOG_ENTRY_KEY = ("domain", "namespace", "identifier")
+ALLOWED_CRED_DEF_KEY = (
+    "schema_issuer_did",
+    "creddef_author_did",
+    "schema_name",
+    "version",
+    "tag",
+)
+
+# pick the key fields out of the insert parameters in one C-level call
+_schema_key = itemgetter(*ALLOWED_SCHEMA_KEY)
+_log_entry_key = itemgetter(*ALLOWED_LOG_ENTRY_KEY)
+_cred_def_key = itemgetter(*ALLOWED_CRED_DEF_KEY)
+
+
+def key_uuid(*parts: str) -> uuid.UUID:
+    """Generate the deterministic id of an allow-list row from its key fields.
+
+    The id is the uuid5, in the NAMESPACE_OID namespace, of the key fields
+    concatenated in order. Bulk loads call this directly on whole columns of
+    values; the column default callables below call it for single inserts.
+
+    Returns:
+        uuid.UUID: The generated UUID.
+    """
+    return uuid.uuid5(uuid.NAMESPACE_OID, "".join(parts))
+
+
 def allowed_schema_uuid(context: DefaultExecutionContext):
     """Generate a UUID for a schema using author DID, schema name, and version.
 
@@ -57,11 +87,7 @@ def allowed_schema_uuid(context: DefaultExecutionContext):
     Returns:
         uuid.UUID: The generated UUID based on the schema's unique attributes.
     """
-    pr = context.get_current_parameters()
-    return uuid.uuid5(
-        uuid.NAMESPACE_OID,
-        pr["author_did"] + pr["schema_name"] + pr["version"],
-    )
+    return key_uuid(*_schema_key(context.get_current_parameters()))
 
 
 def allowed_log_entry_uuid(context: DefaultExecutionContext):
@@ -78,11 +104,7 @@ def allowed_log_entry_uuid(context: DefaultExecutionContext):
     Returns:
         uuid.UUID: The generated UUID based on the log entry's unique attributes.
     """
-    pr = context.get_current_parameters()
-    return uuid.uuid5(
-        uuid.NAMESPACE_OID,
-        pr["domain"] + pr["namespace"] + pr["identifier"],
-    )
+    return key_uuid(*_log_entry_key(context.get_current_parameters()))
 
 
 class AllowedSchema(BaseModel, table=True):
@@ -100,6 +122,10 @@ class AllowedSchema(BaseModel, table=True):
       details: Additional details related to this schema
     """
 
+    __table_args__ = (
+        Index("ix_allowedschema_lookup", "author_did", "schema_name", "version"),
+    )
+
     # acapy data ---
     author_did: str = Field(nullable=False, default=None)
     schema_name: str = Field(nullable=False, default=None)
@@ -112,6 +138,7 @@ class AllowedSchema(BaseModel, table=True):
             UUID(as_uuid=True),
             default=allowed_schema_uuid,
             primary_key=True,
+            info={"uuid5_key": ALLOWED_SCHEMA_KEY},
         )
     )
 
@@ -143,15 +170,7 @@ def allowed_cred_def_uuid(context: DefaultExecutionContext):
         uuid.UUID: The generated UUID for the credential definition.
 
     """
-    pr = context.get_current_parameters()
-    return uuid.uuid5(
-        uuid.NAMESPACE_OID,
-        pr["schema_issuer_did"]
-        + pr["creddef_author_did"]
-        + pr["schema_name"]
-        + pr["version"]
-        + pr["tag"],
-    )
+    return key_uuid(*_cred_def_key(context.get_current_parameters()))
 
 
 class AllowedCredentialDefinition(BaseModel, table=True):
@@ -176,6 +195,17 @@ class AllowedCredentialDefinition(BaseModel, table=True):
       details: Additional details related to this credential definition
     """
 
+    __table_args__ = (
+        Index(
+            "ix_allowedcredentialdefinition_lookup",
+            "schema_issuer_did",
+            "creddef_author_did",
+            "schema_name",
+            "tag",
+            "version",
+        ),
+    )
+
     # acapy data ---
     schema_issuer_did: str = Field(nullable=False, default=None)
     creddef_author_did: str = Field(nullable=False, default=None)
@@ -192,6 +222,7 @@ class AllowedCredentialDefinition(BaseModel, table=True):
             UUID(as_uuid=True),
             default=allowed_cred_def_uuid,
             primary_key=True,
+            info={"uuid5_key": ALLOWED_CRED_DEF_KEY},
         )
     )
 
@@ -222,6 +253,10 @@ class AllowedLogEntry(BaseModel, table=True):
       details:        Additional details related to this schema
     """
 
+    __table_args__ = (
+        Index("ix_allowedlogentry_lookup", "scid", "domain", "namespace", "identifier"),
+    )
+
     # acapy data ---
     scid: str = Field(nullable=False, default=None, primary_key=True)
     domain: str = Field(nullable=False, default=None)
@@ -238,6 +273,7 @@ class AllowedLogEntry(BaseModel, table=True):
             UUID(as_uuid=True),
             default=allowed_log_entry_uuid,
             primary_key=True,
+            info={"uuid5_key": ALLOWED_LOG_ENTRY_KEY},
         )
     )
 
@@ -249,3 +285,19 @@ class AllowedLogEntry(BaseModel, table=True):
             TIMESTAMP, nullable=False, server_default=func.now(), onupdate=func.now()
         )
     )
+
+
+class AllowListVersion(BaseModel, table=True):
+    """AllowListVersion.
+
+    Write counter for each allow-list table, bumped by a deferred database trigger
+    when a transaction that changed the table commits, so readers see the new
+    version together with the change (postgresql specific dialects in use).
+
+    Attributes:
+      table_name: Name of the allow-list table
+      version:    Number of committed transactions that changed the table
+    """
+
+    table_name: str = Field(nullable=False, default=None, primary_key=True)
+    version: int = Field(sa_column=Column(BigInteger, nullable=False, server_default="0"))
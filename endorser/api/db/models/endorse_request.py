@@ -10,7 +10,7 @@ from datetime import datetime
 from typing import List, Optional
 
 from sqlmodel import Field
-from sqlalchemy import Column, func, text, String
+from sqlalchemy import Column, Index, func, text, String
 from sqlalchemy.dialects.postgresql import UUID, TIMESTAMP, ARRAY
 
 from api.db.models.base import BaseModel
@@ -33,6 +33,11 @@ class EndorseRequest(BaseModel, table=True):
       updated_at: Timestamp when record was last modified
     """
 
+    __table_args__ = (
+        Index("ix_endorserequest_state", "state"),
+        Index("ix_endorserequest_transaction_id", "transaction_id"),
+    )
+
     endorse_request_id: uuid.UUID = Field(
         sa_column=Column(
             UUID(as_uuid=True),
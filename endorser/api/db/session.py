@@ -2,18 +2,40 @@
 
 The module initializes the asynchronous database engine with settings drawn from
 the application configuration and a sessionmaker for handling database sessions. It
-supports database connection pooling and echoing of SQL statements for debugging.
+supports database connection pooling, which can be handed to an external pooler
+such as pgbouncer, and echoing of SQL statements for debugging.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from api.config import settings
 
+if settings.DB_NULL_POOL:
+    # an external pooler (pgbouncer in transaction mode) owns the connections;
+    # a server connection can change between transactions there, so neither
+    # asyncpg nor the SQLAlchemy dialect may keep prepared statements around
+    pool_options = {
+        "poolclass": NullPool,
+        "connect_args": {"statement_cache_size": 0, "prepared_statement_cache_size": 0},
+    }
+else:
+    pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 engine = create_async_engine(
     settings.SQLALCHEMY_DATABASE_URI,
     echo=settings.DB_ECHO_LOG,
     echo_pool=settings.DB_ECHO_LOG,
-    pool_size=20,
+    # executemany inserts (batch endpoints, small CSV uploads) go out as
+    # multi-row VALUES statements of up to this many rows
+    insertmanyvalues_page_size=settings.DB_INSERTMANYVALUES_PAGE_SIZE,
+    **pool_options,
 )
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -0,0 +1,39 @@
+"""ETag helpers for conditional GET requests.
+
+Endpoints set an ETag on their responses and answer a request whose
+If-None-Match already names it with an empty 304 Not Modified.
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from starlette import status
+
+
+def body_etag(body: Any) -> str:
+    """Return a strong ETag derived from the JSON form of a response body."""
+    payload = json.dumps(jsonable_encoder(body), sort_keys=True)
+    return f'"{hashlib.sha256(payload.encode()).hexdigest()}"'
+
+
+def query_digest(request: Request) -> str:
+    """Return a short digest of the request's query parameters, in any order."""
+    params = sorted(request.query_params.multi_items())
+    return hashlib.sha256(repr(params).encode()).hexdigest()[:16]
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Return True if the request's If-None-Match already names `etag`."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def not_modified_response(etag: str) -> Response:
+    """Return an empty 304 Not Modified response carrying `etag`."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -10,9 +10,14 @@ Classes:
 - AllowedSchemaList: Represents a paginated list of allowed schemas.
 - AllowedCredentialDefinitionList: Represents a paginated list of allowed
   credential definitions.
+- AllowedPublicDidIn, AllowedSchemaIn, AllowedCredentialDefinitionIn: Entries
+  submitted to the batch add endpoints.
+- ConfigJob: Status of a CSV configuration upload processed in the background.
 """
 
 import logging
+from enum import Enum
+from typing import Optional
 
 from pydantic import BaseModel
 
@@ -34,14 +39,20 @@ class AllowedPublicDidList(BaseModel):
         page_size (int): The number of items per page.
         page_num (int): The current page number.
         count (int): The number of items in the current page.
-        total_count (int): The total number of items across all pages.
+        total_count (int | None): The total number of items across all pages,
+            unless it was not requested.
+        has_more (bool): Whether another page follows this one.
+        next_cursor (str | None): Key of the last item, to pass as the cursor
+            for the next page; None on the last page.
         dids (list[AllowedPublicDid]): The list of allowed public DIDs.
     """
 
     page_size: int
     page_num: int
     count: int
-    total_count: int
+    total_count: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
     dids: list[AllowedPublicDid]
 
 
@@ -52,14 +63,20 @@ class AllowedSchemaList(BaseModel):
         page_size (int): The number of items per page.
         page_num (int): The current page number.
         count (int): The number of items in the current page.
-        total_count (int): The total number of items across all pages.
+        total_count (int | None): The total number of items across all pages,
+            unless it was not requested.
+        has_more (bool): Whether another page follows this one.
+        next_cursor (str | None): Key of the last item, to pass as the cursor
+            for the next page; None on the last page.
         schemas (list[AllowedSchema]): The list of allowed schemas.
     """
 
     page_size: int
     page_num: int
     count: int
-    total_count: int
+    total_count: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
     schemas: list[AllowedSchema]
 
 
@@ -70,7 +87,11 @@ class AllowedCredentialDefinitionList(BaseModel):
         page_size (int): The number of items per page.
         page_num (int): The current page number.
         count (int): The number of items in the current page.
-        total_count (int): The total number of items across all pages.
+        total_count (int | None): The total number of items across all pages,
+            unless it was not requested.
+        has_more (bool): Whether another page follows this one.
+        next_cursor (str | None): Key of the last item, to pass as the cursor
+            for the next page; None on the last page.
         credentials (list[AllowedCredentialDefinition]):
             The list of allowed credential definitions.
     """
@@ -78,7 +99,9 @@ class AllowedCredentialDefinitionList(BaseModel):
     page_size: int
     page_num: int
     count: int
-    total_count: int
+    total_count: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
     credentials: list[AllowedCredentialDefinition]
 
 
@@ -89,12 +112,96 @@ class AllowedLogEntryList(BaseModel):
         page_size (int): The number of items per page.
         page_num (int): The current page number.
         count (int): The number of items in the current page.
-        total_count (int): The total number of items across all pages.
+        total_count (int | None): The total number of items across all pages,
+            unless it was not requested.
+        has_more (bool): Whether another page follows this one.
+        next_cursor (str | None): Key of the last item, to pass as the cursor
+            for the next page; None on the last page.
         log_entries (list[AllowedLogEntry]): The list of allowed log entries.
     """
 
     page_size: int
     page_num: int
     count: int
-    total_count: int
+    total_count: Optional[int] = None
+    has_more: bool = False
+    next_cursor: Optional[str] = None
     log_entries: list[AllowedLogEntry]
+
+
+class AllowedPublicDidIn(BaseModel):
+    """A DID submitted to the batch add endpoint.
+
+    Attributes:
+        registered_did (str): DID allowed to be registered; * matches any value.
+        details (str | None): Additional details related to this DID.
+    """
+
+    registered_did: str = "*"
+    details: Optional[str] = None
+
+
+class AllowedSchemaIn(BaseModel):
+    """A schema submitted to the batch add endpoint.
+
+    Attributes:
+        author_did (str): DID of the allowed author; * matches any value.
+        schema_name (str): Name of the schema; * matches any value.
+        version (str): Version of the schema; * matches any value.
+        details (str | None): Additional details related to this schema.
+    """
+
+    author_did: str = "*"
+    schema_name: str = "*"
+    version: str = "*"
+    details: Optional[str] = None
+
+
+class AllowedCredentialDefinitionIn(BaseModel):
+    """A credential definition submitted to the batch add endpoint.
+
+    Attributes:
+        schema_issuer_did (str): DID of the schema issuer; * matches any value.
+        creddef_author_did (str): DID of the creddef author; * matches any value.
+        schema_name (str): Name of the schema; * matches any value.
+        version (str): Version of the schema; * matches any value.
+        tag (str): Tag of the creddef; * matches any value.
+        rev_reg_def (bool): If the revocation registry definition should be
+            endorsed.
+        rev_reg_entry (bool): If the revocation registry entry should be endorsed.
+        details (str | None): Additional details related to this creddef.
+    """
+
+    schema_issuer_did: str = "*"
+    creddef_author_did: str = "*"
+    schema_name: str = "*"
+    version: str = "*"
+    tag: str = "*"
+    rev_reg_def: bool = True
+    rev_reg_entry: bool = True
+    details: Optional[str] = None
+
+
+class ConfigJobState(str, Enum):
+    """Enumerate the states of a background configuration upload."""
+
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class ConfigJob(BaseModel):
+    """Status of a CSV configuration upload processed in the background.
+
+    Attributes:
+        job_id (str): Identifier to poll the job with.
+        state (ConfigJobState): Where the job is in its lifecycle.
+        result (dict | None): Rows added per table, once completed.
+        error (str | None): Why the job failed, if it did.
+    """
+
+    job_id: str
+    state: ConfigJobState = ConfigJobState.pending
+    result: Optional[dict] = None
+    error: Optional[str] = None
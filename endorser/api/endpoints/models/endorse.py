@@ -155,9 +155,9 @@ def db_to_txn_object(
     txn_request: EndorseRequest, acapy_txn: dict | None = None
 ) -> EndorseTransaction:
     """Convert from database and acapy objects to model object."""
+    # the ledger request itself is read back from the stored copy, so the
+    # attachment on the acapy record is not decoded here
     if acapy_txn:
-        transaction_request = json.loads(acapy_txn["messages_attach"][0]["data"]["json"])
-        transaction_request.get("operation")
         if 0 < len(acapy_txn["signature_response"]):
             transaction_response = json.loads(
                 acapy_txn["signature_response"][0]["signature"][txn_request.endorser_did]
@@ -2,12 +2,13 @@
 
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 from api.endpoints.dependencies.db import get_db
 from api.endpoints.dependencies.jwt_security import check_access_token
+from api.endpoints.etag import body_etag, not_modified, not_modified_response
 from api.endpoints.models.configurations import ConfigurationType
 from api.services.admin import (
     get_endorser_configs,
@@ -28,13 +29,20 @@ router = APIRouter(tags=["admin"], dependencies=[Depends(check_access_token)])
 
 @router.get("/config", status_code=status.HTTP_200_OK, response_model=dict)
 async def get_config(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-) -> dict:
+) -> dict | Response:
     """Retrieve endorser configurations with optional sorting and paging.
 
     Note: JWT token validation is handled at the router level.
 
+    The response carries an ETag; a request whose If-None-Match matches it gets
+    an empty 304 Not Modified instead.
+
     Args:
+        request (Request): The incoming request, for its If-None-Match header.
+        response (Response): The outgoing response, for its ETag header.
         db (AsyncSession): Database session dependency.
 
     Returns:
@@ -45,6 +53,10 @@ async def get_config(
     """
     try:
         endorser_configs = await get_endorser_configs(db)
+        etag = body_etag(endorser_configs)
+        if not_modified(request, etag):
+            return not_modified_response(etag)
+        response.headers["ETag"] = etag
         return endorser_configs
     except Exception as e:
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -57,12 +69,21 @@ async def get_config(
 )
 async def get_config_by_name(
     config_name: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
-) -> Configuration:
-    """Retrieve an endorser configuration by name asynchronously."""
+) -> Configuration | Response:
+    """Retrieve an endorser configuration by name asynchronously.
+
+    Like `get_config`, the response carries an ETag and honours If-None-Match.
+    """
     # This should take some query params, sorting and paging params...
     try:
         endorser_config = await get_endorser_config(db, config_name)
+        etag = body_etag(endorser_config)
+        if not_modified(request, etag):
+            return not_modified_response(etag)
+        response.headers["ETag"] = etag
         return endorser_config
     except Exception as e:
         raise HTTPException(status_code=HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -13,78 +13,245 @@ Usage:
 
 """
 
+import functools
 import logging
-from codecs import iterdecode
-from csv import DictReader
-from typing import Annotated, Optional, TypeVar
+from typing import Annotated, Any, Awaitable, Callable, Optional, TypeVar
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
-from sqlalchemy import delete, select
-from sqlalchemy.exc import IntegrityError
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import bindparam, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql.functions import func
 from starlette import status
-from starlette.status import HTTP_409_CONFLICT, HTTP_500_INTERNAL_SERVER_ERROR
 
-from api.db.errors import AlreadyExists
 from api.db.models.allow import (
     AllowedCredentialDefinition,
     AllowedLogEntry,
+    AllowListVersion,
     AllowedSchema,
 )
 from api.db.models.base import BaseModel
 from api.endpoints.dependencies.db import get_db
 from api.endpoints.dependencies.jwt_security import check_access_token
+from api.endpoints.etag import not_modified, not_modified_response, query_digest
 from api.endpoints.models.allow import (
+    AllowedCredentialDefinitionIn,
     AllowedCredentialDefinitionList,
     AllowedLogEntryList,
     AllowedPublicDid,
+    AllowedPublicDidIn,
     AllowedPublicDidList,
+    AllowedSchemaIn,
     AllowedSchemaList,
+    ConfigJob,
+)
+from api.services.allow_lists import (
+    add_many_to_allow_list,
+    add_to_allow_list,
+    db_to_http_exception,
+    export_rows,
+    schedule_updated_allowed,
+    update_full_config,
 )
-from api.services.allow_lists import add_to_allow_list, updated_allowed
+from api.services.config_jobs import get_config_job, start_config_job
 
 router = APIRouter(tags=["allow"], dependencies=[Depends(check_access_token)])
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T", bound=BaseModel)
+J = TypeVar("J")
+R = TypeVar("R")
 
-def db_to_http_exception(e: Exception) -> int:
-    """Convert database exceptions to HTTP status codes."""
-    match e:
-        case IntegrityError():
-            return HTTP_409_CONFLICT
-        case AlreadyExists():
-            return HTTP_409_CONFLICT
-        case _:
-            return HTTP_500_INTERNAL_SERVER_ERROR
+# fixed-shape statements are built once and only bind their values per call
+_SELECT_VERSION = select(AllowListVersion.version).where(
+    AllowListVersion.table_name == bindparam("table_name")
+)
+_DELETE_DID = delete(AllowedPublicDid).where(
+    AllowedPublicDid.registered_did == bindparam("did")
+)
+_DELETE_SCHEMA = delete(AllowedSchema).where(
+    AllowedSchema.allowed_schema_id == bindparam("id")
+)
+_DELETE_CRED_DEF = delete(AllowedCredentialDefinition).where(
+    AllowedCredentialDefinition.allowed_cred_def_id == bindparam("id")
+)
+_DELETE_LOG_ENTRY = delete(AllowedLogEntry).where(
+    AllowedLogEntry.allowed_log_entry_id == bindparam("id")
+)
 
 
-T = TypeVar("T", bound=BaseModel)
-J = TypeVar("J")
+def db_errors(fn: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """Report errors raised by an endpoint as HTTP errors.
+
+    HTTPExceptions pass through unchanged; any other exception becomes one whose
+    status comes from `db_to_http_exception` and whose detail is its message.
+    The endpoint's signature is kept, so FastAPI still sees its parameters.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs) -> R:
+        try:
+            return await fn(*args, **kwargs)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+
+    return wrapper
 
 
 async def select_from_table(
     db: AsyncSession,
-    filters: dict[J | None, J],
+    filters: list[tuple[InstrumentedAttribute, J | None]],
     table: type[T],
     page_num: int,
     page_size: int,
-) -> tuple[int, list[T]]:
-    """Select and filter data from a table asynchronously."""
-    skip = (page_num - 1) * page_size
+    key: Any = None,
+    after: Any = None,
+    include_total: bool = True,
+    with_version: bool = False,
+) -> tuple[Optional[int], list[T], bool, Optional[int]]:
+    """Select and filter data from a table asynchronously.
+
+    Each filter is a (column, value) pair; pairs whose value is None are ignored,
+    while falsy values such as False or "" are still matched.
+    One row beyond the page is fetched to tell whether another page follows.
+    With `include_total`, the total number of matching rows is computed with a
+    window function over the filtered set, so the page and its total come back
+    in one round-trip; only a page past the last one needs a separate count.
+    Without it the total is None and the database stops after the page.
+    With `with_version`, the table's write version is read as a column of the
+    same query, and so from the same snapshot as the page.
+
+    Rows are ordered by `key` when one is given. If `after` is also given, the
+    page is the `page_size` rows whose key follows it (keyset pagination) and
+    `page_num` is ignored; this is an index seek rather than an OFFSET scan, and
+    the total then counts the matching rows from the cursor onward.
+
+    Returns:
+        The total (or None), the page of rows, whether more rows follow it and
+        the table version (None unless asked for and the page has rows).
+    """
     filter_conditions = [
-        cond == value if value else True for value, cond in filters.items()
+        column == value for column, value in filters if value is not None
     ]
-    base_q = select(table).filter(*filter_conditions)
-    count_q = select(func.count()).select_from(base_q.subquery())
-    q = base_q.limit(page_size).offset(skip)
-    count_result = await db.execute(count_q)
-    total_count: int = count_result.scalar() or 0
-
+    columns: list[Any] = [table]
+    if include_total:
+        columns.append(func.count().over().label("total_count"))
+    if with_version:
+        version = (
+            select(AllowListVersion.version)
+            .where(AllowListVersion.table_name == table.__tablename__)
+            .scalar_subquery()
+        )
+        columns.append(version.label("table_version"))
+    q = select(*columns)
+    if key is not None:
+        q = q.order_by(key)
+    skip = 0
+    if after is not None:
+        q = q.where(key > after, *filter_conditions).limit(page_size + 1)
+    else:
+        skip = (page_num - 1) * page_size
+        q = q.where(*filter_conditions).limit(page_size + 1).offset(skip)
     result = await db.execute(q)
-    db_txn: list[T] = result.scalars().all()
-    return (total_count, db_txn)
+    rows = result.all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    total_count: Optional[int] = None
+    if include_total:
+        if rows:
+            total_count = rows[0].total_count
+        elif skip:
+            # a page past the end has no row to carry the window count
+            q = select(func.count()).select_from(table).where(*filter_conditions)
+            total_count = (await db.execute(q)).scalar_one()
+        else:
+            total_count = 0
+    table_version = rows[0].table_version if with_version and rows else None
+    db_txn: list[T] = [row[0] for row in rows]
+    return (total_count, db_txn, has_more, table_version)
+
+
+def next_cursor(db_txn: list[T], key: Any, has_more: bool) -> str | None:
+    """Return the cursor for the page after `db_txn`, or None if it was the last."""
+    if not has_more:
+        return None
+    return str(getattr(db_txn[-1], key.key))
+
+
+def version_etag(table: type[BaseModel], version: int, request: Request) -> str:
+    """Return a weak ETag for a list request on an allow-list table.
+
+    The tag combines the table's write version, which a database trigger bumps
+    whenever a transaction that changed the table commits, with a digest of the
+    query parameters.
+    """
+    return f'W/"{table.__tablename__}-{version}-{query_digest(request)}"'
+
+
+async def allow_list_etag(
+    db: AsyncSession, table: type[BaseModel], request: Request
+) -> Optional[str]:
+    """Read the table's version and return its list ETag, or None without one."""
+    params = {"table_name": table.__tablename__}
+    version = (await db.execute(_SELECT_VERSION, params)).scalar_one_or_none()
+    if version is None:
+        return None
+    return version_etag(table, version, request)
+
+
+async def conditional_etag(
+    db: AsyncSession, table: type[BaseModel], request: Request
+) -> Optional[str]:
+    """Return the list ETag up front, only for a request that may get a 304.
+
+    Other requests read the version with the page itself (see `page_etag`), so
+    they pay no separate round-trip for it.
+    """
+    if not request.headers.get("if-none-match"):
+        return None
+    return await allow_list_etag(db, table, request)
+
+
+async def page_etag(
+    db: AsyncSession, table: type[BaseModel], request: Request, version: Optional[int]
+) -> Optional[str]:
+    """Return the list ETag from the version read with a page.
+
+    An empty page carries no version, so it is read separately then.
+    """
+    if version is not None:
+        return version_etag(table, version, request)
+    return await allow_list_etag(db, table, request)
+
+
+def set_cache_headers(response: Response, etag: Optional[str]) -> None:
+    """Set the ETag on a list response so clients can revalidate it."""
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, must-revalidate"
+
+
+def export_response(model: type[BaseModel]) -> StreamingResponse:
+    """Stream every entry of an allow list as newline-delimited JSON."""
+    return StreamingResponse(
+        export_rows(model),
+        media_type="application/x-ndjson",
+        # tell proxies to pass chunks on as they arrive rather than buffer them
+        headers={"X-Accel-Buffering": "no"},
+    )
 
 
 @router.post(
@@ -93,7 +260,10 @@ async def select_from_table(
     response_model=dict,
     description="Upload a new CSV config replacing the existing configuration.",
 )
+@db_errors
 async def set_config(
+    background_tasks: BackgroundTasks,
+    response: Response,
     log_entry: Annotated[
         Optional[UploadFile],
         File(description="List of log entries authorized to be published"),
@@ -110,15 +280,28 @@ async def set_config(
         Optional[UploadFile],
         File(description="List of creddefs authorized to be published"),
     ] = None,
+    background: bool = False,
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    """Set new configuration by uploading CSVs, replacing the existing configuration."""
-    try:
-        return await update_full_config(
-            log_entry, publish_did, schema, credential_definition, db, True
+    """Set new configuration by uploading CSVs, replacing the existing configuration.
+
+    With `background`, the upload is applied after the response is sent and a
+    202 with a job id to poll on /config/jobs/{job_id} is returned instead.
+    """
+    if background:
+        job = await start_config_job(
+            background_tasks,
+            log_entry,
+            publish_did,
+            schema,
+            credential_definition,
+            True,
         )
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+        response.status_code = status.HTTP_202_ACCEPTED
+        return job.model_dump()
+    return await update_full_config(
+        log_entry, publish_did, schema, credential_definition, db, True
+    )
 
 
 @router.put(
@@ -127,7 +310,10 @@ async def set_config(
     response_model=dict,
     description="Upload a new CSV config appending to the existing configuration.",
 )
+@db_errors
 async def append_config(
+    background_tasks: BackgroundTasks,
+    response: Response,
     log_entry: Annotated[
         Optional[UploadFile],
         File(description="List of log entries authorized to be published"),
@@ -143,15 +329,57 @@ async def append_config(
     credential_definition: Annotated[
         Optional[UploadFile], File(description="List of authorized creddefs")
     ] = None,
+    background: bool = False,
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    """Append new configuration by uploading CSVs to the existing configuration."""
-    try:
-        return await update_full_config(
-            log_entry, publish_did, schema, credential_definition, db, False
+    """Append new configuration by uploading CSVs to the existing configuration.
+
+    With `background`, the upload is applied after the response is sent and a
+    202 with a job id to poll on /config/jobs/{job_id} is returned instead.
+    """
+    if background:
+        job = await start_config_job(
+            background_tasks,
+            log_entry,
+            publish_did,
+            schema,
+            credential_definition,
+            False,
         )
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+        response.status_code = status.HTTP_202_ACCEPTED
+        return job.model_dump()
+    return await update_full_config(
+        log_entry, publish_did, schema, credential_definition, db, False
+    )
+
+
+@router.get(
+    "/config/jobs/{job_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=ConfigJob,
+    description="Get the status of a CSV config upload running in the background.",
+)
+async def get_config_job_status(job_id: str) -> ConfigJob:
+    """Fetch the status of a background configuration upload."""
+    job = get_config_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Configuration upload {job_id} not found",
+        )
+    return job
+
+
+@router.get(
+    "/publish-did/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    description="Export every DID that will be auto endorsed\
+    as newline-delimited JSON",
+)
+async def export_allowed_dids() -> StreamingResponse:
+    """Stream all allowed DIDs."""
+    return export_response(AllowedPublicDid)
 
 
 @router.get(
@@ -161,33 +389,66 @@ async def append_config(
     description="Get a list of DIDs that will be auto endorsed\
     when sent to the ledger by an author",
 )
+@db_errors
 async def get_allowed_dids(
+    request: Request,
+    response: Response,
     did: Optional[str] = None,
     page_size: int = 10,
     page_num: int = 1,
+    after_did: Optional[str] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db),
-) -> AllowedPublicDidList:
+) -> AllowedPublicDidList | Response:
     """Fetch allowed public DIDs with pagination."""
-    try:
-        total_count: int
-        db_txn: list[AllowedPublicDid]
-        total_count, db_txn = await select_from_table(
-            db,
-            {did: AllowedPublicDid.registered_did},
-            AllowedPublicDid,
-            page_num,
-            page_size,
-        )
-
-        return AllowedPublicDidList(
-            page_size=page_size,
-            page_num=page_num,
-            total_count=total_count,
-            count=len(db_txn),
-            dids=db_txn,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    etag = await conditional_etag(db, AllowedPublicDid, request)
+    if etag is not None and not_modified(request, etag):
+        return not_modified_response(etag)
+    db_txn: list[AllowedPublicDid]
+    total_count, db_txn, has_more, version = await select_from_table(
+        db,
+        [(AllowedPublicDid.registered_did, did)],
+        AllowedPublicDid,
+        page_num,
+        page_size,
+        AllowedPublicDid.registered_did,
+        after_did,
+        include_total,
+        with_version=etag is None,
+    )
+
+    if etag is None:
+        etag = await page_etag(db, AllowedPublicDid, request, version)
+    set_cache_headers(response, etag)
+    return AllowedPublicDidList(
+        page_size=page_size,
+        page_num=page_num,
+        total_count=total_count,
+        has_more=has_more,
+        count=len(db_txn),
+        next_cursor=next_cursor(db_txn, AllowedPublicDid.registered_did, has_more),
+        dids=db_txn,
+    )
+
+
+# registered ahead of /publish-did/{did} so "batch" is not taken as a DID
+@router.post(
+    "/publish-did/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=dict,
+    description="Add several DIDs that will be auto endorsed when published by an\
+    author, in a single insert.",
+)
+@db_errors
+async def add_allowed_dids(
+    entries: list[AllowedPublicDidIn],
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Add several DIDs to the allow list."""
+    count = await add_many_to_allow_list(
+        db, AllowedPublicDid, [e.model_dump() for e in entries]
+    )
+    return {"count": count}
 
 
 @router.post(
@@ -197,17 +458,16 @@ async def get_allowed_dids(
     description="Add a new DID that will be auto endorsed when published by an author.\
     Any field marked with a * or left empty match on any value.",
 )
+@db_errors
 async def add_allowed_did(
     did: str = "*",
     details: str | None = None,
     db: AsyncSession = Depends(get_db),
 ) -> AllowedPublicDid:
     """Add a new DID to the allow list."""
-    try:
-        adid = AllowedPublicDid(registered_did=did, details=details)
-        return await add_to_allow_list(db, adid)
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    return await add_to_allow_list(
+        db, AllowedPublicDid, {"registered_did": did, "details": details}
+    )
 
 
 @router.delete(
@@ -217,18 +477,28 @@ async def add_allowed_did(
     description="Remove a DID from the list of DIDs that will be auto endorsed\
     when published to the ledger",
 )
+@db_errors
 async def delete_allowed_did(
     did: str,
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Delete a DID from the allow list."""
-    try:
-        q = delete(AllowedPublicDid).where(AllowedPublicDid.registered_did == did)
-        await db.execute(q)
-        await updated_allowed(db)
-        return {}
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    await db.execute(_DELETE_DID, {"did": did})
+    await db.commit()
+    schedule_updated_allowed()
+    return {}
+
+
+@router.get(
+    "/schema/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    description="Export every schema that will be auto endorsed\
+    as newline-delimited JSON",
+)
+async def export_allowed_schemas() -> StreamingResponse:
+    """Stream all allowed schemas."""
+    return export_response(AllowedSchema)
 
 
 @router.get(
@@ -238,37 +508,55 @@ async def delete_allowed_did(
     description="Get a list of schemas that will be auto endorsed\
     when sent to the ledger by an author",
 )
+@db_errors
 async def get_allowed_schemas(
+    request: Request,
+    response: Response,
     allowed_schema_id: Optional[UUID] = None,
     author_did: Optional[str] = None,
     schema_name: Optional[str] = None,
     version: Optional[str] = None,
     page_size: int = 10,
     page_num: int = 1,
+    after_id: Optional[UUID] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db),
-) -> AllowedSchemaList:
+) -> AllowedSchemaList | Response:
     """Fetch allowed schemas with pagination."""
-    try:
-        filter = {
-            allowed_schema_id: AllowedSchema.allowed_schema_id,
-            author_did: AllowedSchema.author_did,
-            schema_name: AllowedSchema.schema_name,
-            version: AllowedSchema.version,
-        }
-
-        db_txn: list[AllowedSchema]
-        total_count, db_txn = await select_from_table(
-            db, filter, AllowedSchema, page_num, page_size
-        )
-        return AllowedSchemaList(
-            page_size=page_size,
-            page_num=page_num,
-            total_count=total_count,
-            count=len(db_txn),
-            schemas=db_txn,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    etag = await conditional_etag(db, AllowedSchema, request)
+    if etag is not None and not_modified(request, etag):
+        return not_modified_response(etag)
+    filter = [
+        (AllowedSchema.allowed_schema_id, allowed_schema_id),
+        (AllowedSchema.author_did, author_did),
+        (AllowedSchema.schema_name, schema_name),
+        (AllowedSchema.version, version),
+    ]
+
+    db_txn: list[AllowedSchema]
+    total_count, db_txn, has_more, version = await select_from_table(
+        db,
+        filter,
+        AllowedSchema,
+        page_num,
+        page_size,
+        AllowedSchema.allowed_schema_id,
+        after_id,
+        include_total,
+        with_version=etag is None,
+    )
+    if etag is None:
+        etag = await page_etag(db, AllowedSchema, request, version)
+    set_cache_headers(response, etag)
+    return AllowedSchemaList(
+        page_size=page_size,
+        page_num=page_num,
+        total_count=total_count,
+        has_more=has_more,
+        count=len(db_txn),
+        next_cursor=next_cursor(db_txn, AllowedSchema.allowed_schema_id, has_more),
+        schemas=db_txn,
+    )
 
 
 @router.post(
@@ -279,6 +567,7 @@ async def get_allowed_schemas(
     when sent to the ledger by an author.\
     Any field marked with a * or left empty match on any value.",
 )
+@db_errors
 async def add_allowed_schema(
     author_did: str = "*",
     schema_name: str = "*",
@@ -287,16 +576,35 @@ async def add_allowed_schema(
     db: AsyncSession = Depends(get_db),
 ) -> AllowedSchema:
     """Add a new schema to the allow list."""
-    try:
-        tmp = AllowedSchema(
-            author_did=author_did,
-            schema_name=schema_name,
-            version=version,
-            details=details,
-        )
-        return await add_to_allow_list(db, tmp)
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    return await add_to_allow_list(
+        db,
+        AllowedSchema,
+        {
+            "author_did": author_did,
+            "schema_name": schema_name,
+            "version": version,
+            "details": details,
+        },
+    )
+
+
+@router.post(
+    "/schema/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=dict,
+    description="Add several schemas that will be auto endorsed when sent to the\
+    ledger by an author, in a single insert.",
+)
+@db_errors
+async def add_allowed_schemas(
+    entries: list[AllowedSchemaIn],
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Add several schemas to the allow list."""
+    count = await add_many_to_allow_list(
+        db, AllowedSchema, [e.model_dump() for e in entries]
+    )
+    return {"count": count}
 
 
 @router.delete(
@@ -306,20 +614,28 @@ async def add_allowed_schema(
     description="Remove a schema from the list of schemas that will be auto endorsed\
     when sent to the ledger",
 )
+@db_errors
 async def delete_allowed_schema(
     allowed_schema_id: UUID,
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Delete a schema from the allow list."""
-    try:
-        q = delete(AllowedSchema).where(
-            AllowedSchema.allowed_schema_id == allowed_schema_id
-        )
-        await db.execute(q)
-        await updated_allowed(db)
-        return {}
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    await db.execute(_DELETE_SCHEMA, {"id": allowed_schema_id})
+    await db.commit()
+    schedule_updated_allowed()
+    return {}
+
+
+@router.get(
+    "/credential-definition/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    description="Export every credential definition that will be auto endorsed\
+    as newline-delimited JSON",
+)
+async def export_allowed_cred_defs() -> StreamingResponse:
+    """Stream all allowed credential definitions."""
+    return export_response(AllowedCredentialDefinition)
 
 
 @router.get(
@@ -329,7 +645,10 @@ async def delete_allowed_schema(
     description="Get a list of credential definitions that will be auto endorsed\
     when sent to the ledger by an author",
 )
+@db_errors
 async def get_allowed_cred_def(
+    request: Request,
+    response: Response,
     allowed_cred_def_id: Optional[UUID] = None,
     schema_issuer_did: Optional[str] = None,
     creddef_author_did: Optional[str] = None,
@@ -340,35 +659,51 @@ async def get_allowed_cred_def(
     rev_reg_entry: Optional[bool] = None,
     page_size: int = 10,
     page_num: int = 1,
+    after_id: Optional[UUID] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db),
-) -> AllowedCredentialDefinitionList:
+) -> AllowedCredentialDefinitionList | Response:
     """Fetch allowed credential definitions with pagination."""
-    try:
-        filters = {
-            allowed_cred_def_id: AllowedCredentialDefinition.allowed_cred_def_id,
-            schema_issuer_did: AllowedCredentialDefinition.schema_issuer_did,
-            creddef_author_did: AllowedCredentialDefinition.creddef_author_did,
-            schema_name: AllowedCredentialDefinition.schema_name,
-            version: AllowedCredentialDefinition.version,
-            tag: AllowedCredentialDefinition.tag,
-            rev_reg_def: AllowedCredentialDefinition.rev_reg_def,
-            rev_reg_entry: AllowedCredentialDefinition.rev_reg_entry,
-        }
-
-        db_txn: list[AllowedCredentialDefinition]
-        total_count, db_txn = await select_from_table(
-            db, filters, AllowedCredentialDefinition, page_num, page_size
-        )
-        await updated_allowed(db)
-        return AllowedCredentialDefinitionList(
-            page_size=page_size,
-            page_num=page_num,
-            total_count=total_count,
-            count=len(db_txn),
-            credentials=db_txn,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    etag = await conditional_etag(db, AllowedCredentialDefinition, request)
+    if etag is not None and not_modified(request, etag):
+        return not_modified_response(etag)
+    filters = [
+        (AllowedCredentialDefinition.allowed_cred_def_id, allowed_cred_def_id),
+        (AllowedCredentialDefinition.schema_issuer_did, schema_issuer_did),
+        (AllowedCredentialDefinition.creddef_author_did, creddef_author_did),
+        (AllowedCredentialDefinition.schema_name, schema_name),
+        (AllowedCredentialDefinition.version, version),
+        (AllowedCredentialDefinition.tag, tag),
+        (AllowedCredentialDefinition.rev_reg_def, rev_reg_def),
+        (AllowedCredentialDefinition.rev_reg_entry, rev_reg_entry),
+    ]
+
+    db_txn: list[AllowedCredentialDefinition]
+    total_count, db_txn, has_more, version = await select_from_table(
+        db,
+        filters,
+        AllowedCredentialDefinition,
+        page_num,
+        page_size,
+        AllowedCredentialDefinition.allowed_cred_def_id,
+        after_id,
+        include_total,
+        with_version=etag is None,
+    )
+    if etag is None:
+        etag = await page_etag(db, AllowedCredentialDefinition, request, version)
+    set_cache_headers(response, etag)
+    return AllowedCredentialDefinitionList(
+        page_size=page_size,
+        page_num=page_num,
+        total_count=total_count,
+        has_more=has_more,
+        count=len(db_txn),
+        next_cursor=next_cursor(
+            db_txn, AllowedCredentialDefinition.allowed_cred_def_id, has_more
+        ),
+        credentials=db_txn,
+    )
 
 
 @router.post(
@@ -379,6 +714,7 @@ async def get_allowed_cred_def(
     sent to the ledger by an author.\
     Any field marked with a * or left empty match on any value.",
 )
+@db_errors
 async def add_allowed_cred_def(
     schema_issuer_did: str = "*",
     creddef_author_did: str = "*",
@@ -391,20 +727,39 @@ async def add_allowed_cred_def(
     db: AsyncSession = Depends(get_db),
 ) -> AllowedCredentialDefinition:
     """Add a new credential definition to the allow list."""
-    try:
-        acreddef = AllowedCredentialDefinition(
-            schema_issuer_did=schema_issuer_did,
-            creddef_author_did=creddef_author_did,
-            schema_name=schema_name,
-            tag=tag,
-            rev_reg_def=rev_reg_def,
-            rev_reg_entry=rev_reg_entry,
-            version=version,
-            details=details,
-        )
-        return await add_to_allow_list(db, acreddef)
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    return await add_to_allow_list(
+        db,
+        AllowedCredentialDefinition,
+        {
+            "schema_issuer_did": schema_issuer_did,
+            "creddef_author_did": creddef_author_did,
+            "schema_name": schema_name,
+            "tag": tag,
+            "rev_reg_def": rev_reg_def,
+            "rev_reg_entry": rev_reg_entry,
+            "version": version,
+            "details": details,
+        },
+    )
+
+
+@router.post(
+    "/credential-definition/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=dict,
+    description="Add several credential definitions that will be auto endorsed when\
+    sent to the ledger by an author, in a single insert.",
+)
+@db_errors
+async def add_allowed_cred_defs(
+    entries: list[AllowedCredentialDefinitionIn],
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Add several credential definitions to the allow list."""
+    count = await add_many_to_allow_list(
+        db, AllowedCredentialDefinition, [e.model_dump() for e in entries]
+    )
+    return {"count": count}
 
 
 @router.delete(
@@ -414,120 +769,28 @@ async def add_allowed_cred_def(
     description="Remove a credential definition from the list of credential \
     definitions that will be auto endorsed when sent to the ledger",
 )
+@db_errors
 async def delete_allowed_cred_def(
     allowed_cred_def_id: UUID,
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Delete a credential definition from the allow list."""
-    try:
-        q = delete(AllowedCredentialDefinition).where(
-            AllowedCredentialDefinition.allowed_cred_def_id == allowed_cred_def_id
-        )
-        await db.execute(q)
-        await updated_allowed(db)
-        return {}
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
-
+    await db.execute(_DELETE_CRED_DEF, {"id": allowed_cred_def_id})
+    await db.commit()
+    schedule_updated_allowed()
+    return {}
 
-def maybe_str_to_bool(s: str) -> str | bool:
-    """Convert string to boolean if applicable."""
-    return s == "True" if isinstance(s, str) else s
 
-
-def construct_allowed_credential_definition(cd: dict) -> AllowedCredentialDefinition:
-    """Construct AllowedCredentialDefinition with proper boolean conversion."""
-    cd["rev_reg_def"] = maybe_str_to_bool(cd["rev_reg_def"])
-    cd["rev_reg_entry"] = maybe_str_to_bool(cd["rev_reg_entry"])
-    ncd = AllowedCredentialDefinition(**cd)
-    return ncd
-
-
-async def update_allowed_config(k, v, db):
-    """Update the allowed configuration in the database with entries from a CSV file.
-
-    This function reads a CSV file, constructs instances of specified classes,
-    and adds them to the database.
-
-    Args:
-        k: An object with attributes 'file' (CSV file handle)
-           and 'filename' (name of the CSV file).
-        v: A class type, used to construct instances from CSV data.
-        db: Database session to which the constructed instances are added.
-
-    Returns:
-        A dictionary containing the filename and list of constructed class instances.
-
-    """
-    csvReader = DictReader(iterdecode(k.file, "utf-8"))
-    constructed_classes = [
-        (
-            construct_allowed_credential_definition(i)
-            if v is AllowedCredentialDefinition
-            else v(**i)
-        )
-        for i in csvReader
-    ]
-    tmp = {
-        "file_name": k.filename,
-        "contents": constructed_classes,
-    }
-    for i in tmp["contents"]:
-        db.add(i)
-    return tmp
-
-
-async def update_full_config(
-    log_entry: Optional[UploadFile],
-    publish_did: Optional[UploadFile],
-    schema: Optional[UploadFile],
-    credential_definition: Optional[UploadFile],
-    db: AsyncSession,
-    delete_contents: bool,
-) -> dict:
-    """Update full configuration, possibly deleting existing entries.
-
-    Allows callers to provide any subset of the four CSV files; only the provided
-    files are processed and, when `delete_contents` is True, only the corresponding
-    tables are cleared before insert.
-    """
-    provided_configs = [
-        (log_entry, AllowedLogEntry),
-        (publish_did, AllowedPublicDid),
-        (schema, AllowedSchema),
-        (credential_definition, AllowedCredentialDefinition),
-    ]
-    # Filter out None values and files with empty filenames (empty form fields)
-    provided_configs = [
-        (file, model)
-        for file, model in provided_configs
-        if file is not None and file.filename
-    ]
-
-    if not provided_configs:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="At least one configuration file must be provided.",
-        )
-
-    try:
-        modifications: dict[str, dict] = {}
-        for file_obj, model in provided_configs:
-            if delete_contents:
-                await db.execute(delete(model))
-            modifications[model.__name__] = await update_allowed_config(
-                file_obj, model, db
-            )
-
-        await db.commit()
-    except Exception:
-        await db.rollback()
-        raise
-
-    # Reprocess pending transactions after successful commit
-    # This runs outside the transaction since it does its own commit
-    await updated_allowed(db)
-    return modifications
+@router.get(
+    "/log-entry/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    description="Export every log entry that will be auto endorsed\
+    as newline-delimited JSON",
+)
+async def export_allowed_log_entries() -> StreamingResponse:
+    """Stream all allowed log entries."""
+    return export_response(AllowedLogEntry)
 
 
 @router.get(
@@ -537,37 +800,55 @@ async def update_full_config(
     description="Get a list of log entries that will be auto endorsed\
     when sent to the ledger by an author",
 )
+@db_errors
 async def get_allowed_log_entries(
+    request: Request,
+    response: Response,
     scid: Optional[str] = None,
     domain: Optional[str] = None,
     namespace: Optional[str] = None,
     identifier: Optional[str] = None,
     page_size: int = 10,
     page_num: int = 1,
+    after_id: Optional[UUID] = None,
+    include_total: bool = True,
     db: AsyncSession = Depends(get_db),
-) -> AllowedLogEntryList:
+) -> AllowedLogEntryList | Response:
     """Fetch allowed log entries with pagination."""
-    try:
-        filter = {
-            scid: AllowedLogEntry.scid,
-            domain: AllowedLogEntry.domain,
-            namespace: AllowedLogEntry.namespace,
-            identifier: AllowedLogEntry.identifier,
-        }
-
-        db_txn: list[AllowedLogEntry]
-        total_count, db_txn = await select_from_table(
-            db, filter, AllowedLogEntry, page_num, page_size
-        )
-        return AllowedLogEntryList(
-            page_size=page_size,
-            page_num=page_num,
-            total_count=total_count,
-            count=len(db_txn),
-            log_entries=db_txn,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    etag = await conditional_etag(db, AllowedLogEntry, request)
+    if etag is not None and not_modified(request, etag):
+        return not_modified_response(etag)
+    filter = [
+        (AllowedLogEntry.scid, scid),
+        (AllowedLogEntry.domain, domain),
+        (AllowedLogEntry.namespace, namespace),
+        (AllowedLogEntry.identifier, identifier),
+    ]
+
+    db_txn: list[AllowedLogEntry]
+    total_count, db_txn, has_more, version = await select_from_table(
+        db,
+        filter,
+        AllowedLogEntry,
+        page_num,
+        page_size,
+        AllowedLogEntry.allowed_log_entry_id,
+        after_id,
+        include_total,
+        with_version=etag is None,
+    )
+    if etag is None:
+        etag = await page_etag(db, AllowedLogEntry, request, version)
+    set_cache_headers(response, etag)
+    return AllowedLogEntryList(
+        page_size=page_size,
+        page_num=page_num,
+        total_count=total_count,
+        has_more=has_more,
+        count=len(db_txn),
+        next_cursor=next_cursor(db_txn, AllowedLogEntry.allowed_log_entry_id, has_more),
+        log_entries=db_txn,
+    )
 
 
 @router.post(
@@ -578,6 +859,7 @@ async def get_allowed_log_entries(
     when sent to the ledger by a controller.\
     Any field marked with a * or left empty match on any value.",
 )
+@db_errors
 async def add_allowed_log_entry(
     scid: str = "*",
     domain: str = "*",
@@ -586,16 +868,16 @@ async def add_allowed_log_entry(
     db: AsyncSession = Depends(get_db),
 ) -> AllowedLogEntry:
     """Add a new log entry to the allow list."""
-    try:
-        tmp = AllowedLogEntry(
-            scid=scid,
-            domain=domain,
-            namespace=namespace,
-            identifier=identifier,
-        )
-        return await add_to_allow_list(db, tmp)
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    return await add_to_allow_list(
+        db,
+        AllowedLogEntry,
+        {
+            "scid": scid,
+            "domain": domain,
+            "namespace": namespace,
+            "identifier": identifier,
+        },
+    )
 
 
 @router.delete(
@@ -605,17 +887,13 @@ async def add_allowed_log_entry(
     description="Remove a log entry from the list of log entries that will be auto \
     endorsed when sent to the ledger",
 )
+@db_errors
 async def delete_allowed_log_entry(
     allowed_log_entry_id: UUID,
     db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Delete a log entry from the allow list."""
-    try:
-        q = delete(AllowedLogEntry).where(
-            AllowedLogEntry.allowed_log_entry_id == allowed_log_entry_id
-        )
-        await db.execute(q)
-        await updated_allowed(db)
-        return {}
-    except Exception as e:
-        raise HTTPException(status_code=db_to_http_exception(e), detail=str(e))
+    await db.execute(_DELETE_LOG_ENTRY, {"id": allowed_log_entry_id})
+    await db.commit()
+    schedule_updated_allowed()
+    return {}
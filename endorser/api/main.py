@@ -2,18 +2,23 @@
 
 This module sets up a FastAPI server to host the Endorser service. It configures
 logging, sets environment variables, and mounts the main application along with
-webhook and endorser routes. The application responds to startup and shutdown events
-to register necessary events and manage lifecycle operations.
+webhook and endorser routes. Process setup (logging and timezone) runs from the
+application's lifespan handler at startup.
 """
 
 import logging
+import logging.config
 import os
 import time
+from contextlib import asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator
 
 import uvicorn
 from fastapi import FastAPI
 from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import Receive, Scope, Send
 from starlette_context import plugins
 from starlette_context.middleware import RawContextMiddleware
 
@@ -28,26 +33,62 @@ from api.endpoints.routes import (
     webhooks,
 )
 
-# setup loggers
-# TODO: set config via env parameters...
-logging_file_path = (Path(__file__).parent / "logging.conf").resolve()
-logging.config.fileConfig(logging_file_path, disable_existing_loggers=False)
+logger = logging.getLogger(__name__)
 
-log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
-logging.basicConfig(level=log_level)
-logging.root.setLevel(level=log_level)
 
-logger = logging.getLogger(__name__)
+class ExportAwareGZipMiddleware(GZipMiddleware):
+    """GZip middleware that leaves the streamed NDJSON exports uncompressed.
+
+    The gzip responder buffers compressed output until it has a full block, which
+    holds back the export rows that are meant to reach the client as they are read.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Pass export requests straight through, compress the rest."""
+        if scope["type"] == "http" and scope["path"].endswith("/export"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
 
 middleware = [
     Middleware(
         RawContextMiddleware,
         plugins=(plugins.RequestIdPlugin(), plugins.CorrelationIdPlugin()),
     ),
+    # compress responses big enough to benefit, such as allow-list pages
+    Middleware(ExportAwareGZipMiddleware, minimum_size=1024, compresslevel=5),
 ]
 
-os.environ["TZ"] = settings.TIMEZONE
-time.tzset()
+
+def init_process() -> None:
+    """Configure logging and the timezone for this process.
+
+    Runs when the app starts rather than on import, so importing the module (as
+    the tests do) reads no config files, and logging already set up by the host
+    process is left in place.
+    """
+    # setup loggers
+    # TODO: set config via env parameters...
+    if not logging.root.handlers:
+        logging_file_path = (Path(__file__).parent / "logging.conf").resolve()
+        logging.config.fileConfig(logging_file_path, disable_existing_loggers=False)
+
+    log_level = os.getenv("LOG_LEVEL", "WARNING").upper()
+    logging.basicConfig(level=log_level)
+    logging.root.setLevel(level=log_level)
+
+    os.environ["TZ"] = settings.TIMEZONE
+    time.tzset()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Set up the process on startup and log the app starting and stopping."""
+    init_process()
+    logger.warning(">>> Starting up app ...")
+    yield
+    logger.warning(">>> Shutting down app ...")
 
 
 def endorser_app() -> FastAPI:
@@ -104,24 +145,13 @@ app = FastAPI(
     description=settings.DESCRIPTION,
     debug=settings.DEBUG,
     middleware=None,
+    lifespan=lifespan,
 )
 
 app.mount("/endorser", endorser_app())
 app.mount("/webhook", webhook_app())
 
 
-@app.on_event("startup")
-async def on_endorser_startup():
-    """Register any events we need to respond to."""
-    logger.warning(">>> Starting up app ...")
-
-
-@app.on_event("shutdown")
-def on_endorser_shutdown():
-    """TODO no-op for now."""
-    logger.warning(">>> Sutting down app ...")
-
-
 @app.get("/", tags=["liveness"])
 def main():
     """Main function that returns the status and health information.
@@ -1,6 +1,8 @@
 """Endorser configuration management module for Aries Endorser Service."""
 
 import logging
+import time
+from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -23,9 +25,39 @@ from api.services.configurations import (
 
 logger = logging.getLogger(__name__)
 
+# how long, in seconds, a snapshot of the endorser configuration is served from
+# memory; updates made through this process invalidate it immediately
+CONFIG_CACHE_TTL = 5.0
+
+# (taken at, records by config name, get_endorser_configs response)
+_config_snapshot: Optional[tuple[float, dict[str, Configuration], dict]] = None
+
+# transaction types accepted in ENDORSER_AUTO_ENDORSE_TXN_TYPES
+_TXN_TYPE_VALUES = frozenset(e.value for e in EndorseTransactionType)
+
+
+def _fresh_snapshot() -> Optional[tuple[float, dict[str, Configuration], dict]]:
+    """Return the configuration snapshot if it is younger than the cache TTL."""
+    if _config_snapshot and time.monotonic() - _config_snapshot[0] < CONFIG_CACHE_TTL:
+        return _config_snapshot
+    return None
+
+
+def invalidate_endorser_configs() -> None:
+    """Drop the configuration snapshot so the next read goes to the sources."""
+    global _config_snapshot
+    _config_snapshot = None
+
 
 async def get_endorser_configs(db: AsyncSession) -> dict:
-    """Retrieve Endorser configurations from the database and ACA-Py."""
+    """Retrieve Endorser configurations from the database and ACA-Py.
+
+    The result is served from a snapshot for up to `CONFIG_CACHE_TTL` seconds.
+    """
+    global _config_snapshot
+    if snapshot := _fresh_snapshot():
+        return snapshot[2]
+
     acapy_config = await au.acapy_GET(
         "status/config",
     )
@@ -44,15 +76,26 @@ async def get_endorser_configs(db: AsyncSession) -> dict:
         endorser_configs[endorser_config.config_name] = endorser_config.json()
     endorser_configs["public_did"] = endorser_public_did["result"]
 
-    return {
+    configs = {
         "acapy_config": acapy_config["config"],
         "endorser_config": endorser_configs,
         "webvh_config": webvh_config,
     }
+    _config_snapshot = (
+        time.monotonic(),
+        {c.config_name.name: c for c in endorser_config_list},
+        configs,
+    )
+    return configs
 
 
 async def get_endorser_config(db: AsyncSession, config_name: str) -> Configuration:
-    """Fetch the endorser configuration record by config name."""
+    """Fetch the endorser configuration record by config name.
+
+    The record is taken from the configuration snapshot while it is fresh.
+    """
+    if (snapshot := _fresh_snapshot()) and config_name in snapshot[1]:
+        return snapshot[1][config_name]
     return await get_config_record(db, config_name)
 
 
@@ -63,9 +106,8 @@ def validate_endorser_config(
     """Process and validate the endorser configuration using the given name and value."""
     if config_name == ConfigurationType.ENDORSER_AUTO_ENDORSE_TXN_TYPES.value:
         config_vals = config_value.split(",")
-        txn_type_vals = [e.value for e in EndorseTransactionType]
         for config_val in config_vals:
-            if config_val not in txn_type_vals:
+            if config_val not in _TXN_TYPE_VALUES:
                 raise Exception(f"Error {config_val} is not a valid transaction type")
     elif config_name == ConfigurationType.ENDORSER_AUTO_ACCEPT_CONNECTIONS.value:
         # TODO: Implement functionality for auto-accepting connections
@@ -87,4 +129,6 @@ async def update_endorser_config(
     config_value: str,
 ) -> Configuration:
     """Update endorser configuration record asynchronously."""
-    return await update_config_record(db, config_name, config_value)
+    config = await update_config_record(db, config_name, config_value)
+    invalidate_endorser_configs()
+    return config
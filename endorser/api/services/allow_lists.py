@@ -1,75 +1,582 @@
-"""Module for handling database operations related to the endorsement service."""
+"""Database operations for the allow lists and the pending transactions they unlock.
 
+Includes the CSV upload handling shared by the allow-list configuration endpoints.
+"""
+
+import asyncio
+import csv
+import functools
+import io
 import logging
-from typing import TypeVar
+from itertools import batched, chain, islice, repeat
+from typing import AsyncIterator, Iterable, Optional, Sequence, TypeVar
 
+from asyncpg.exceptions import UniqueViolationError
+from fastapi import HTTPException, UploadFile
 from psycopg2.errors import UniqueViolation
-from sqlalchemy import select
+from sqlalchemy import Boolean, exists, insert, literal, select, text, union_all
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+from starlette.status import HTTP_409_CONFLICT, HTTP_500_INTERNAL_SERVER_ERROR
 
 from api.db.errors import AlreadyExists
+from api.db.models.allow import (
+    AllowedCredentialDefinition,
+    AllowedLogEntry,
+    AllowedPublicDid,
+    AllowedSchema,
+    key_uuid,
+)
 from api.db.models.base import BaseModel
 from api.db.models.endorse_request import EndorseRequest
+from api.db.session import async_session
 from api.endpoints.models.endorse import (
+    EndorseTransaction,
     EndorseTransactionState,
     db_to_txn_object,
 )
-from api.services.auto_state_handlers import is_endorsable_transaction
-from api.services.endorse import endorse_transaction
+from api.services.auto_state_handlers import (
+    allow_lookups_for_pass,
+    is_endorsable_transaction,
+    prefetch_schema_ids,
+)
+from api.services.endorse import endorse_transactions
 
 logger = logging.getLogger(__name__)
 
+# CSV uploads larger than this are loaded with COPY rather than through the ORM
+BULK_COPY_THRESHOLD = 100
+BULK_COPY_CHUNK_SIZE = 10_000
+# batch adds of more than this many entries are loaded with COPY
+BATCH_COPY_THRESHOLD = 500
+# rows fetched from the server-side cursor per chunk of an export
+EXPORT_BATCH_SIZE = 1000
+# CSV uploads up to this size are decoded in one call instead of streamed
+DECODE_IN_MEMORY_MAX_SIZE = 8 * 1024 * 1024
+
+
+_HTTP_STATUS_BY_EXCEPTION: dict[type[Exception], int] = {
+    IntegrityError: HTTP_409_CONFLICT,
+    AlreadyExists: HTTP_409_CONFLICT,
+    # raised by asyncpg itself for COPY loads, which bypass SQLAlchemy
+    UniqueViolationError: HTTP_409_CONFLICT,
+}
+
+
+def db_to_http_exception(e: Exception) -> int:
+    """Convert database exceptions to HTTP status codes.
+
+    The exception's class hierarchy is walked, so subclasses of a mapped
+    exception get its status, as an isinstance check would give them.
+    """
+    for cls in type(e).__mro__:
+        code = _HTTP_STATUS_BY_EXCEPTION.get(cls)
+        if code is not None:
+            return code
+    return HTTP_500_INTERNAL_SERVER_ERROR
+
 
 async def updated_allowed(db: AsyncSession) -> None:
-    """Update and endorse allowed transactions."""
+    """Update and endorse allowed transactions.
+
+    The schemas the pending requests refer to are looked up concurrently up
+    front, and allow-list answers are shared across the pass. Every pending
+    request that the allow lists now cover is endorsed in a single
+    `endorse_transactions` batch, and the new states are committed once.
+    """
     try:
         q = select(EndorseRequest).where(
             EndorseRequest.state == EndorseTransactionState.request_received
         )
         result = await db.execute(q)
         db_txns: list[EndorseRequest] = result.scalars().all()
-        for txn in db_txns:
-            transaction = db_to_txn_object(txn, acapy_txn=None)
-            logger.debug(
-                f">>> from updated_allowed: the current transaction is {transaction}"
-            )
-            was_allowed = await is_endorsable_transaction(db, transaction)
-            logger.debug(f">>> from updated_allowed: this was allowed? {was_allowed}")
-            if was_allowed:
+        transactions = [db_to_txn_object(txn, acapy_txn=None) for txn in db_txns]
+        await prefetch_schema_ids(transactions)
+        endorsable: list[EndorseTransaction] = []
+        with allow_lookups_for_pass():
+            for transaction in transactions:
                 logger.debug(
-                    f">>> from updated_allowed: endorsing transaction: {transaction}"
+                    f">>> from updated_allowed: the current transaction is {transaction}"
                 )
-                await endorse_transaction(db, transaction)
+                was_allowed = await is_endorsable_transaction(db, transaction)
+                logger.debug(f">>> from updated_allowed: this was allowed? {was_allowed}")
+                if was_allowed:
+                    endorsable.append(transaction)
+        if endorsable:
+            logger.debug(
+                f">>> from updated_allowed: endorsing {len(endorsable)} transactions"
+            )
+            await endorse_transactions(db, endorsable)
         await db.commit()
     except Exception as e:
         logger.error(f"Failed to update pending transactions {e}")
 
 
+# how long a scheduled refresh waits, so a burst of allow-list changes is
+# handled by a single pass of updated_allowed
+REFRESH_DELAY = 0.2
+
+_pending_refresh: Optional[asyncio.Task] = None
+# set by every schedule call; a change committed while a pass is running makes
+# the same task run another pass once it finishes
+_refresh_requested = False
+# refreshes never overlap, so no transaction is endorsed twice
+_refresh_lock = asyncio.Lock()
+
+
+async def _refresh_after(delay: float) -> None:
+    """Wait `delay` seconds, then run updated_allowed in a session of its own.
+
+    Passes are repeated until no change was scheduled during the last one, and
+    the task only stops being the pending refresh once it is done.
+    """
+    global _pending_refresh, _refresh_requested
+    try:
+        while True:
+            await asyncio.sleep(delay)
+            # changes committed from here on are picked up by another pass
+            _refresh_requested = False
+            async with _refresh_lock, async_session() as db:
+                await updated_allowed(db)
+            if not _refresh_requested:
+                break
+    finally:
+        _pending_refresh = None
+
+
+def schedule_updated_allowed() -> None:
+    """Re-evaluate pending transactions shortly after an allow-list change.
+
+    Calls made while a refresh is waiting to run are folded into it, so a burst
+    of adds or deletes costs one scan of the pending transactions; calls made
+    while it is running make it scan once more rather than start a second task,
+    so passes never run side by side. The change must be committed before this
+    is called, as the refresh uses its own session.
+    """
+    global _pending_refresh, _refresh_requested
+    _refresh_requested = True
+    if _pending_refresh is None:
+        _pending_refresh = asyncio.create_task(_refresh_after(REFRESH_DELAY))
+
+
 B = TypeVar("B", bound=BaseModel)
 
 
-async def add_to_allow_list(db: AsyncSession, a: B) -> B:
-    """Add an instance to the allow list and commit the transaction.
+async def add_to_allow_list(db: AsyncSession, model: type[B], data: dict) -> B:
+    """Add an entry to the allow list and commit the transaction.
+
+    The entry is inserted with a RETURNING clause, so the stored row, including
+    its generated id and timestamps, comes back in the same round-trip.
 
     Args:
         db (AsyncSession): Database session for async operations.
-        a (B): Instance to be added to the allow list.
+        model (type[B]): Table model the entry belongs to.
+        data (dict): Column values for the entry.
 
     Returns:
-        B: The instance that was added to the allow list.
+        B: The entry that was added to the allow list.
 
     Raises:
-        AlreadyExists: If the instance already exists in the allow list.
+        AlreadyExists: If the entry already exists in the allow list.
         Exception: If any error occurs that is not a UniqueViolation.
     """
     try:
-        db.add(a)
+        stmt = insert(model).values(**data).returning(model)
+        a = (await db.execute(stmt)).scalar_one()
         await db.commit()
-        await updated_allowed(db)
+        schedule_updated_allowed()
         return a
     except IntegrityError as e:
         if isinstance(e.orig, UniqueViolation):
-            raise AlreadyExists(f"{a} already exists")
+            raise AlreadyExists(f"{model.__name__} {data} already exists")
         else:
             raise e
+
+
+async def add_many_to_allow_list(
+    db: AsyncSession, model: type[BaseModel], rows: list[dict]
+) -> int:
+    """Add several entries to an allow list in a single statement and commit.
+
+    The rows are sent as one executemany INSERT, which SQLAlchemy batches into
+    multi-row VALUES statements, or with COPY when there are more than
+    `BATCH_COPY_THRESHOLD` of them. Pending transactions are re-evaluated once
+    for the whole batch rather than once per entry.
+
+    Args:
+        db (AsyncSession): Database session for async operations.
+        model (type[BaseModel]): Table model the entries belong to.
+        rows (list[dict]): Column values for each entry.
+
+    Returns:
+        int: The number of entries added.
+
+    Raises:
+        AlreadyExists: If any of the entries already exists in the allow list.
+        Exception: If any error occurs that is not a UniqueViolation.
+    """
+    if not rows:
+        return 0
+    try:
+        if len(rows) > BATCH_COPY_THRESHOLD:
+            header = list(rows[0])
+            values = ([row[name] for name in header] for row in rows)
+            await bulk_copy(db, model, header, values, from_text=False)
+        else:
+            await db.execute(insert(model), rows)
+        await db.commit()
+    except UniqueViolationError:
+        await db.rollback()
+        raise AlreadyExists(f"{model.__name__} entry already exists")
+    except IntegrityError as e:
+        await db.rollback()
+        if isinstance(e.orig, UniqueViolation):
+            raise AlreadyExists(f"{model.__name__} entry already exists")
+        raise e
+    schedule_updated_allowed()
+    return len(rows)
+
+
+async def export_rows(model: type[BaseModel]) -> AsyncIterator[bytes]:
+    """Yield every entry of an allow list as newline-delimited JSON.
+
+    The rows are read through a server-side cursor `EXPORT_BATCH_SIZE` at a time
+    and each batch is encoded and yielded before the next is fetched, so memory
+    use does not grow with the table. The export uses its own session, which
+    stays open for as long as the response is being streamed.
+    """
+    async with async_session() as db:
+        q = select(model).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        result = await db.stream(q)
+        async for rows in result.scalars().partitions():
+            yield b"".join(row.model_dump_json().encode() + b"\n" for row in rows)
+
+
+# CSV spellings of a true boolean; anything else reads as False
+_TRUE_VALUES = frozenset(
+    {"True", "true", "TRUE", "1", "t", "T", "yes", "Yes", "YES", "y", "Y"}
+)
+
+
+@functools.cache
+def _column_layout(
+    table,
+) -> tuple[frozenset[str], tuple[tuple[str, tuple], ...], tuple[tuple[str, object], ...]]:
+    """Return a table's boolean column names, uuid5 id columns and scalar defaults.
+
+    Each id column comes with the names of the key fields it is computed from,
+    and each column with a constant Python-side default comes with that value.
+    The layout only depends on the table, so it is worked out once per table
+    rather than on every upload.
+    """
+    booleans = frozenset(c.name for c in table.columns if isinstance(c.type, Boolean))
+    key_ids = tuple(
+        (c.name, c.info["uuid5_key"])
+        for c in table.primary_key.columns
+        if "uuid5_key" in c.info
+    )
+    scalar_defaults = tuple(
+        (c.name, c.default.arg)
+        for c in table.columns
+        if c.default is not None and c.default.is_scalar
+    )
+    return booleans, key_ids, scalar_defaults
+
+
+def _boolean_indexes(table, header: list[str]) -> list[int]:
+    """Return the positions in `header` of the table's boolean columns."""
+    booleans, _, _ = _column_layout(table)
+    return [i for i, name in enumerate(header) if name in booleans]
+
+
+def _missing_defaults(table, header: list[str]) -> list[tuple[str, object]]:
+    """Return the scalar column defaults for columns missing from `header`."""
+    _, _, scalar_defaults = _column_layout(table)
+    return [(name, value) for name, value in scalar_defaults if name not in header]
+
+
+def _key_id_columns(table, header: list[str]) -> list[tuple[str, list[int]]]:
+    """Find the deterministic id columns missing from a CSV header.
+
+    Returns each such column's name with the positions, in `header`, of the key
+    fields its uuid5 is computed from.
+    """
+    _, key_ids, _ = _column_layout(table)
+    return [
+        (name, [header.index(field) for field in key])
+        for name, key in key_ids
+        if name not in header
+    ]
+
+
+def _convert_rows(
+    rows: Sequence[list],
+    bool_idx: list[int],
+    key_columns: Sequence[tuple[str, list[int]]] = (),
+    defaults: Sequence[object] = (),
+) -> list[tuple]:
+    """Convert parsed CSV rows to the values stored, a column at a time.
+
+    The rows are transposed so each boolean column is converted with one C-level
+    `map` over set membership rather than a Python call per value, and each id
+    in `key_columns` is computed with one `map` of `key_uuid` over its key
+    columns. The ids are appended to every row, in `key_columns` order, followed
+    by the constant `defaults`.
+
+    Raises:
+        ValueError: If the rows do not all have the same number of fields.
+    """
+    try:
+        columns = list(zip(*rows, strict=True))
+    except ValueError:
+        raise ValueError("CSV rows must all have the same number of fields") from None
+    ids = [map(key_uuid, *(columns[i] for i in idx)) for _, idx in key_columns]
+    for i in bool_idx:
+        columns[i] = map(_TRUE_VALUES.__contains__, columns[i])
+    return list(zip(*columns, *ids, *map(repeat, defaults)))
+
+
+async def bulk_copy(
+    db: AsyncSession,
+    v: type[BaseModel],
+    header: list[str],
+    rows: Iterable[list],
+    from_text: bool = True,
+) -> int:
+    """Load rows into the table backing `v` with the Postgres COPY protocol.
+
+    COPY bypasses both the ORM and Core column defaults, so boolean columns are
+    converted from their CSV text here, the deterministic uuid5 primary keys
+    are computed a column at a time from their key fields, and constant Core
+    defaults are filled in for columns the rows leave out. The copy runs on
+    the session's own connection, and the session's transaction is begun first
+    if nothing has been executed on it yet, so a failed load, or a later failure
+    before commit, is rolled back with the rest of the transaction.
+
+    Rows are consumed `BULK_COPY_CHUNK_SIZE` at a time. Reading and converting a
+    chunk is CPU-bound, so it runs in a worker thread, and the next chunk is
+    prepared while the current one is being copied; at most two chunks are held
+    in memory.
+
+    Args:
+        db: Database session whose connection is used for the copy.
+        v: Table model the rows belong to.
+        header: Column names, in the order the values appear in each row.
+        rows: Rows read from the CSV file.
+        from_text: Whether the values are CSV text; if False, booleans are
+            taken as they are.
+
+    Returns:
+        The number of rows copied.
+    """
+    table = v.__table__
+    bool_idx = _boolean_indexes(table, header) if from_text else []
+    key_columns = _key_id_columns(table, header)
+    defaults = _missing_defaults(table, header)
+    columns = header + [name for name, _ in chain(key_columns, defaults)]
+    default_values = [value for _, value in defaults]
+    chunks = batched(rows, BULK_COPY_CHUNK_SIZE)
+
+    def next_records() -> Optional[list[tuple]]:
+        chunk = next(chunks, None)
+        if chunk is None:
+            return None
+        return _convert_rows(chunk, bool_idx, key_columns, default_values)
+
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    if not raw.driver_connection.is_in_transaction():
+        # SQLAlchemy's asyncpg adapter only sends BEGIN ahead of the first
+        # statement it executes; a COPY sent straight to asyncpg before that
+        # would run, and commit, chunk by chunk outside the session's transaction
+        await conn.exec_driver_sql("SELECT 1")
+    count = 0
+    records = await asyncio.to_thread(next_records)
+    while records is not None:
+        following = asyncio.ensure_future(asyncio.to_thread(next_records))
+        try:
+            await raw.driver_connection.copy_records_to_table(
+                table.name, records=records, columns=columns
+            )
+        except BaseException:
+            following.cancel()
+            raise
+        count += len(records)
+        records = await following
+    return count
+
+
+async def insert_rows(
+    db: AsyncSession, v: type[BaseModel], header: list[str], rows: list[list]
+) -> int:
+    """Insert rows into the table backing `v` with one Core executemany INSERT.
+
+    The rows never become ORM instances, so nothing is added to the session's
+    identity map. The uuid5 ids are computed here, as in `bulk_copy`, so the
+    per-row column default never fires.
+
+    Args:
+        db: Database session the insert runs in.
+        v: Table model the rows belong to.
+        header: Column names, in the order the values appear in each row.
+        rows: Rows read from the CSV file.
+
+    Returns:
+        The number of rows inserted.
+    """
+    if not rows:
+        return 0
+    table = v.__table__
+    bool_idx = _boolean_indexes(table, header)
+    key_columns = _key_id_columns(table, header)
+    columns = header + [name for name, _ in key_columns]
+    rows = _convert_rows(rows, bool_idx, key_columns)
+    await db.execute(table.insert(), [dict(zip(columns, row)) for row in rows])
+    return len(rows)
+
+
+async def update_allowed_config(k, v, db):
+    """Update the allowed configuration in the database with entries from a CSV file.
+
+    This function reads a CSV file and inserts its rows into the table backing
+    the given model. Files of known size up to `DECODE_IN_MEMORY_MAX_SIZE` are
+    decoded in one call; others are decoded as a buffered stream. Once the file
+    is known to hold more than `BULK_COPY_THRESHOLD` rows it is loaded with
+    `bulk_copy`, otherwise with a single `insert_rows` statement.
+
+    Args:
+        k: An object with attributes 'file' (CSV file handle)
+           and 'filename' (name of the CSV file).
+        v: Table model the CSV rows belong to.
+        db: Database session the rows are inserted in.
+
+    Returns:
+        A dictionary containing the filename and the number of rows added.
+
+    """
+    size = getattr(k, "size", None)
+    if size is not None and size <= DECODE_IN_MEMORY_MAX_SIZE:
+        text = io.StringIO(k.file.read().decode("utf-8"), newline="")
+    else:
+        # decodes the stream a buffer at a time rather than line by line
+        text = io.TextIOWrapper(k.file, encoding="utf-8", newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, [])
+        # csv.reader yields an empty list for blank lines, which DictReader skipped
+        rows = filter(None, reader)
+        head = list(islice(rows, BULK_COPY_THRESHOLD + 1))
+        if len(head) > BULK_COPY_THRESHOLD:
+            count = await bulk_copy(db, v, header, chain(head, rows))
+        else:
+            count = await insert_rows(db, v, header, head)
+    finally:
+        if isinstance(text, io.TextIOWrapper):
+            # leave the upload open for its owner to close
+            text.detach()
+    return {"file_name": k.filename, "count": count}
+
+
+# tables populated by the config upload, in the order their files are accepted
+CONFIG_MODELS: tuple[type[BaseModel], ...] = (
+    AllowedLogEntry,
+    AllowedPublicDid,
+    AllowedSchema,
+    AllowedCredentialDefinition,
+)
+
+
+def provided_configs(
+    log_entry: Optional[UploadFile],
+    publish_did: Optional[UploadFile],
+    schema: Optional[UploadFile],
+    credential_definition: Optional[UploadFile],
+) -> list[tuple[UploadFile, type[BaseModel]]]:
+    """Pair each uploaded configuration file with the table it populates.
+
+    Files that were not provided, or were sent as empty form fields, are dropped.
+
+    Raises:
+        HTTPException: If no file was provided.
+    """
+    uploads = (log_entry, publish_did, schema, credential_definition)
+    # Filter out None values and files with empty filenames (empty form fields)
+    configs = [
+        (file, model)
+        for file, model in zip(uploads, CONFIG_MODELS)
+        if file is not None and file.filename
+    ]
+
+    if not configs:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one configuration file must be provided.",
+        )
+    return configs
+
+
+async def _tables_with_rows(
+    db: AsyncSession, models: Iterable[type[BaseModel]]
+) -> set[str]:
+    """Return the names of the models' tables that hold at least one row.
+
+    Every table is probed in one statement, a UNION ALL of `EXISTS` checks, so
+    the answer costs a single round-trip however many tables are asked about.
+    """
+    q = union_all(
+        *(
+            select(literal(model.__tablename__)).where(exists().select_from(model))
+            for model in models
+        )
+    )
+    return set((await db.scalars(q)).all())
+
+
+async def update_full_config(
+    log_entry: Optional[UploadFile],
+    publish_did: Optional[UploadFile],
+    schema: Optional[UploadFile],
+    credential_definition: Optional[UploadFile],
+    db: AsyncSession,
+    delete_contents: bool,
+) -> dict:
+    """Update full configuration, possibly deleting existing entries.
+
+    Allows callers to provide any subset of the four CSV files; only the provided
+    files are processed and, when `delete_contents` is True, only the corresponding
+    tables that hold rows are cleared, in a single TRUNCATE, before insert.
+    """
+    configs = provided_configs(log_entry, publish_did, schema, credential_definition)
+
+    try:
+        if delete_contents:
+            # TRUNCATE is transactional in Postgres and, unlike DELETE, does not
+            # write a dead tuple per existing row; one statement clears every table.
+            # Tables that are already empty are left out, and skipped entirely
+            # when none of them hold rows
+            filled = await _tables_with_rows(db, (model for _, model in configs))
+            tables = [
+                model.__tablename__
+                for _, model in configs
+                if model.__tablename__ in filled
+            ]
+            if tables:
+                await db.execute(text(f"TRUNCATE TABLE {', '.join(tables)}"))
+        modifications: dict[str, dict] = {}
+        for file_obj, model in configs:
+            modifications[model.__name__] = await update_allowed_config(
+                file_obj, model, db
+            )
+
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    # Reprocess pending transactions after successful commit
+    # This runs outside the transaction since it does its own commit, and under
+    # the refresh lock so a scheduled refresh cannot endorse the same requests
+    async with _refresh_lock:
+        await updated_allowed(db)
+    return modifications
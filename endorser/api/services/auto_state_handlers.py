@@ -11,13 +11,18 @@ managing transaction states, and handling connection requests with async
 database operations.
 """
 
+import asyncio
+import functools
 import logging
+import operator
 import traceback
-from typing import Any, cast
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional, cast
 
-from attr import dataclass
-from sqlalchemy import or_, select
-from sqlalchemy.engine.row import Row
+from sqlalchemy import Select, bindparam, exists, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import api.acapy_utils as au
@@ -147,7 +152,7 @@ async def auto_step_connections_completed(
     return {}
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CreddefCriteria:
     """Criteria for identifying credential definitions."""
 
@@ -158,7 +163,7 @@ class CreddefCriteria:
     Tag: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SchemaCriteria:
     """Criteria for identifying schemas."""
 
@@ -167,7 +172,7 @@ class SchemaCriteria:
     Version: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LogEntryCriteria:
     """Criteria for identifying log entries."""
 
@@ -177,12 +182,55 @@ class LogEntryCriteria:
     identifier: str
 
 
-def eq_or_wild(indb, clause: str | Any):
-    """Evaluate equality with wildcard support."""
-    if isinstance(clause, str):
-        return or_(indb == clause, indb == "*")
-    else:
-        return indb == clause
+def _filter_shape(value: Any) -> str:
+    """Classify a filter value by the SQL comparison it needs."""
+    if isinstance(value, str):
+        return "wild"
+    return "null" if value is None else "eq"
+
+
+@functools.lru_cache(maxsize=64)
+def allow_exists_statement(table: type, shape: tuple[tuple[str, str], ...]) -> Select:
+    """Build the EXISTS query for filters on `table` once per column layout.
+
+    `shape` pairs each column name with its `_filter_shape`. String values also
+    match a "*" wildcard entry; other values are bound as `bindparam`s named after
+    their column, so only the parameters change between calls.
+    """
+    clauses = []
+    for name, kind in shape:
+        column = getattr(table, name)
+        if kind == "wild":
+            clauses.append(or_(column == bindparam(name), column == "*"))
+        elif kind == "null":
+            clauses.append(column.is_(None))
+        else:
+            clauses.append(column == bindparam(name))
+    # EXISTS stops at the first match, and an exact entry plus a wildcard one
+    # matching together is still a single answer
+    return select(exists().where(*clauses))
+
+
+# allow-list answers remembered for the duration of one pass over the pending
+# transactions; outside such a pass every lookup asks the database, so no answer
+# outlives the change that revokes it, in this worker or any other
+_pass_lookups: ContextVar[Optional[dict[tuple, bool]]] = ContextVar(
+    "allow_list_pass_lookups", default=None
+)
+
+
+@contextmanager
+def allow_lookups_for_pass() -> Iterator[None]:
+    """Share allow-list answers between the lookups made inside the block.
+
+    Meant for one scan of the pending transactions, where many requests repeat
+    the same criteria; the answers are dropped when the block exits.
+    """
+    token = _pass_lookups.set({})
+    try:
+        yield
+    finally:
+        _pass_lookups.reset(token)
 
 
 async def check_auto_endorse(
@@ -190,16 +238,29 @@ async def check_auto_endorse(
     table: type,
     filters: list[tuple[Any, Any]],
 ) -> bool:
-    """Check if a transaction can be auto-endorsed based on configured filters."""
-    wild_filters = [eq_or_wild(x, y) for x, y in filters]
-    q = select(table).filter(*wild_filters)
-    result = await db.execute(q)
-    result_rec: Row | None = result.one_or_none()
-    logger.debug(f"got the following record {result_rec} with query {q}")
-    if result_rec:
-        return True
-    else:
-        return False
+    """Check if a transaction can be auto-endorsed based on configured filters.
+
+    Inside `allow_lookups_for_pass`, answers are remembered for the rest of the
+    pass, keyed by the table, filter columns and filter values, so pending
+    transactions that repeat the same criteria cost one query. Elsewhere every
+    call queries the database. The query itself is built once per table and
+    column layout by `allow_exists_statement`.
+    """
+    shape = tuple((x.key, _filter_shape(y)) for x, y in filters)
+    lookups = _pass_lookups.get()
+    # the shape names the columns, so the same values checked against different
+    # columns (rev_reg_def vs rev_reg_entry) are remembered apart
+    key = (table.__tablename__, shape, *(y for _, y in filters))
+    if lookups is not None and key in lookups:
+        return lookups[key]
+
+    q = allow_exists_statement(table, shape)
+    params = {x.key: y for x, y in filters if y is not None}
+    allowed: bool = bool(await db.scalar(q, params))
+    logger.debug("got %s with query %s %s", allowed, q, params)
+    if lookups is not None:
+        lookups[key] = allowed
+    return allowed
 
 
 async def allowed_publish_did(db: AsyncSession, did: str) -> bool:
@@ -254,6 +315,73 @@ async def allowed_creddef(db: AsyncSession, creddef_trans: CreddefCriteria) -> b
     )
 
 
+SCHEMA_CACHE_SIZE = 1024
+# schema lookups sent to ACA-Py at the same time by prefetch_schema_ids
+SCHEMA_PREFETCH_CONCURRENCY = 10
+_schema_ids: OrderedDict[int, list[str]] = OrderedDict()
+
+
+async def get_schema_id(sequence_num: int) -> list[str]:
+    """Return the parts of the id of the schema at a ledger sequence number.
+
+    A sequence number always refers to the same schema, so answers are kept for
+    the most recent `SCHEMA_CACHE_SIZE` schemas rather than fetched again.
+    """
+    parts = _schema_ids.get(sequence_num)
+    if parts is None:
+        response = cast(dict, await au.acapy_GET("schemas/" + str(sequence_num)))
+        parts = response["schema"]["id"].split(":")
+        _schema_ids[sequence_num] = parts
+        if len(_schema_ids) > SCHEMA_CACHE_SIZE:
+            _schema_ids.popitem(last=False)
+    return parts
+
+
+def schema_sequence_num(trans: EndorseTransaction) -> Optional[int]:
+    """Return the sequence number of the schema a transaction refers to, if any."""
+    if (not trans.author_did) or (not trans.transaction):
+        return None
+    match trans.transaction_type:
+        case EndorseTransactionType.revoc_registry:
+            # ex "3w88pmVPfeVaz8bMukH2uR:3:CL:81268:default"
+            return int(trans.transaction["credDefId"].split(":")[3])
+        case EndorseTransactionType.revoc_entry:
+            return int(trans.transaction["revocRegDefId"].split(":")[5])
+        case EndorseTransactionType.cred_def:
+            return int(cast(int, trans.transaction.get("ref")))
+    return None
+
+
+async def prefetch_schema_ids(txns: Iterable[EndorseTransaction]) -> None:
+    """Look up, concurrently, the schemas a batch of transactions refers to.
+
+    Up to `SCHEMA_PREFETCH_CONCURRENCY` lookups run at a time, and
+    `is_endorsable_transaction` then finds them cached instead of waiting on one
+    lookup at a time. Transactions that cannot be parsed, and lookups that fail,
+    are skipped here and left to `is_endorsable_transaction` to report.
+    """
+    sequence_nums = set()
+    for trans in txns:
+        try:
+            sequence_num = schema_sequence_num(trans)
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+        if sequence_num is not None and sequence_num not in _schema_ids:
+            sequence_nums.add(sequence_num)
+
+    semaphore = asyncio.Semaphore(SCHEMA_PREFETCH_CONCURRENCY)
+
+    async def prefetch(sequence_num: int) -> list[str]:
+        async with semaphore:
+            return await get_schema_id(sequence_num)
+
+    await asyncio.gather(*map(prefetch, sequence_nums), return_exceptions=True)
+
+
+# name and version of the schema in a schema transaction's "data"
+_schema_name_version = operator.itemgetter("name", "version")
+
+
 async def is_endorsable_transaction(db: AsyncSession, trans: EndorseTransaction) -> bool:
     """Determine if a transaction can be endorsed based on its type and attributes."""
     logger.debug(">>> from is_endorsable_transaction: entered")
@@ -289,14 +417,13 @@ async def is_endorsable_transaction(db: AsyncSession, trans: EndorseTransaction)
                 # ex "3w88pmVPfeVaz8bMukH2uR:3:CL:81268:default"
                 credDefId: list[str] = trans.transaction["credDefId"].split(":")
                 cred_auth_did = credDefId[0]
-                sequence_num = int(credDefId[3])
+                sequence_num = cast(int, schema_sequence_num(trans))
                 tag = credDefId[4]
 
                 logger.debug(
                     f">>> from is_endorsable_transaction: {trans} awaiting schema"
                 )
-                response = cast(dict, await au.acapy_GET("schemas/" + str(sequence_num)))
-                schema_id: list[str] = response["schema"]["id"].split(":")
+                schema_id: list[str] = await get_schema_id(sequence_num)
 
                 return await check_auto_endorse(
                     db,
@@ -318,14 +445,13 @@ async def is_endorsable_transaction(db: AsyncSession, trans: EndorseTransaction)
                 revocRegDefId: list[str] = trans.transaction["revocRegDefId"].split(":")
 
                 cred_auth_did = revocRegDefId[0]
-                sequence_num = int(revocRegDefId[5])
+                sequence_num = cast(int, schema_sequence_num(trans))
                 tag = revocRegDefId[6]
 
                 logger.debug(
                     f">>> from is_endorsable_transaction: {trans} awaiting schema"
                 )
-                response = cast(dict, await au.acapy_GET("schemas/" + str(sequence_num)))
-                schema_id: list[str] = response["schema"]["id"].split(":")
+                schema_id: list[str] = await get_schema_id(sequence_num)
                 logger.debug(
                     f">>> from is_endorsable_transaction: {trans} was a revocation entry"
                 )
@@ -346,8 +472,9 @@ async def is_endorsable_transaction(db: AsyncSession, trans: EndorseTransaction)
                 logger.debug(
                     f">>> from is_endorsable_transaction: {trans} was a schema request"
                 )
-                schema = trans.transaction["data"]
-                s = SchemaCriteria(trans.author_did, schema["name"], schema["version"])
+                s = SchemaCriteria(
+                    trans.author_did, *_schema_name_version(trans.transaction["data"])
+                )
                 logger.debug(
                     f">>> from is_endorsable_transaction: {trans} with schema {s}"
                 )
@@ -358,18 +485,18 @@ async def is_endorsable_transaction(db: AsyncSession, trans: EndorseTransaction)
                     f">>> from is_endorsable_transaction: {trans} was a cred_def request"
                 )
 
-                sequence_num: int = cast(int, trans.transaction.get("ref"))
+                # the same parsing prefetch_schema_ids keyed the schema cache with
+                sequence_num = cast(int, schema_sequence_num(trans))
 
                 logger.debug(
                     f">>> from is_endorsable_transaction: {trans} awaiting schema"
                 )
-                response = cast(dict, await au.acapy_GET("schemas/" + str(sequence_num)))
+                schema_id: list[str] = await get_schema_id(sequence_num)
 
                 logger.debug(
                     f">>> from is_endorsable_transaction:\
-                    {trans} was a cred_def request with response {response}"
+                    {trans} was a cred_def request for schema {schema_id}"
                 )
-                schema_id: list[str] = response["schema"]["id"].split(":")
                 return await allowed_creddef(
                     db,
                     CreddefCriteria(
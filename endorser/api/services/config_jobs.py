@@ -0,0 +1,97 @@
+"""Run allow-list CSV configuration uploads after their request has returned.
+
+Jobs are tracked in memory by the process that accepted the upload, so their
+status can only be polled from that process and is lost on restart.
+"""
+
+import logging
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import BackgroundTasks, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from api.db.session import async_session
+from api.endpoints.models.allow import ConfigJob, ConfigJobState
+from api.services.allow_lists import provided_configs, update_full_config
+
+logger = logging.getLogger(__name__)
+
+# only the most recent jobs are kept; older ones are forgotten, oldest first
+MAX_CONFIG_JOBS = 100
+# uploads up to this size are spooled in memory, larger ones go to disk
+SPOOL_MAX_SIZE = 1024 * 1024
+
+_jobs: OrderedDict[str, ConfigJob] = OrderedDict()
+
+
+async def _spool(k: Optional[UploadFile]) -> Optional[UploadFile]:
+    """Copy an upload into a temporary file owned by the job.
+
+    The request's upload files are closed once the request is done with them,
+    which can happen before the background job reads them.
+    """
+    if k is None or not k.filename:
+        return None
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    await k.seek(0)
+    await run_in_threadpool(shutil.copyfileobj, k.file, spool)
+    spool.seek(0)
+    return UploadFile(file=spool, filename=k.filename)
+
+
+async def run_config_job(
+    job: ConfigJob, uploads: list[Optional[UploadFile]], delete_contents: bool
+) -> None:
+    """Apply the uploaded configuration with a session of the job's own."""
+    job.state = ConfigJobState.running
+    try:
+        async with async_session() as db:
+            job.result = await update_full_config(*uploads, db, delete_contents)
+        job.state = ConfigJobState.completed
+    except Exception as e:
+        logger.error(f"Configuration upload {job.job_id} failed: {e}")
+        job.error = str(e)
+        job.state = ConfigJobState.failed
+    finally:
+        for upload in uploads:
+            if upload is not None:
+                upload.file.close()
+
+
+async def start_config_job(
+    background_tasks: BackgroundTasks,
+    log_entry: Optional[UploadFile],
+    publish_did: Optional[UploadFile],
+    schema: Optional[UploadFile],
+    credential_definition: Optional[UploadFile],
+    delete_contents: bool,
+) -> ConfigJob:
+    """Queue a configuration upload to run once the response has been sent.
+
+    Returns:
+        ConfigJob: The pending job, whose id can be polled with `get_config_job`.
+
+    Raises:
+        HTTPException: If no file was provided.
+    """
+    provided_configs(log_entry, publish_did, schema, credential_definition)
+    uploads = [
+        await _spool(k) for k in (log_entry, publish_did, schema, credential_definition)
+    ]
+
+    job = ConfigJob(job_id=str(uuid4()))
+    _jobs[job.job_id] = job
+    while len(_jobs) > MAX_CONFIG_JOBS:
+        _jobs.popitem(last=False)
+
+    background_tasks.add_task(run_config_job, job, uploads, delete_contents)
+    return job
+
+
+def get_config_job(job_id: str) -> Optional[ConfigJob]:
+    """Return the job with the given id, or None if it is unknown."""
+    return _jobs.get(job_id)
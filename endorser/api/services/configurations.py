@@ -13,6 +13,7 @@ Functions:
 - update_config_record: Update a configuration record's value and return the new state.
 - get_bool_config: Retrieve a configuration as a boolean value.
 - get_config: Retrieve a configuration value as a string.
+- refresh_env_snapshot: Re-read the configuration values set in the environment.
 """
 
 import logging
@@ -34,7 +35,23 @@ from api.endpoints.models.configurations import (
 
 logger = logging.getLogger(__name__)
 
-TRUE_VALUES = ["true", "1", "t", "y", "yes", "yeah", "yup", "certainly", "uh-huh"]
+# environment values of the configuration types, read once at startup
+_ENV_SNAPSHOT: dict[str, str] = {}
+
+
+def refresh_env_snapshot() -> None:
+    """Re-read the configuration values set in the environment."""
+    _ENV_SNAPSHOT.clear()
+    _ENV_SNAPSHOT.update(
+        (t.name, os.environ[t.name]) for t in ConfigurationType if t.name in os.environ
+    )
+
+
+refresh_env_snapshot()
+
+TRUE_VALUES = frozenset(
+    {"true", "1", "t", "y", "yes", "yeah", "yup", "certainly", "uh-huh"}
+)
 
 
 async def db_add_db_config_record(db: AsyncSession, db_config: ConfigurationDB):
@@ -122,7 +139,7 @@ async def get_config_record(db: AsyncSession, config_name: str) -> Configuration
         config: Configuration = Configuration(
             config_id=None,
             config_name=ConfigurationType[config_name],
-            config_value=os.getenv(config_name, default),
+            config_value=_ENV_SNAPSHOT.get(config_name, default),
             config_source=ConfigurationSource.Environment,
         )
         return config
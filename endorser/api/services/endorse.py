@@ -15,12 +15,16 @@ Functions:
 - get_transaction_object: Fetch a specific endorsement transaction object for response.
 - store_endorser_request: Store a new endorsement transaction request in the database.
 - endorse_transaction: Endorse a transaction and update its status in the database.
+- endorse_transactions: Endorse several transactions and update their statuses
+                        in bulk.
 - reject_transaction: Reject a transaction and update its status in the database.
 - update_endorsement_status: Update the status of an endorsement transaction
                              in the database.
 """
 
+import asyncio
 import logging
+from collections import defaultdict
 from typing import cast
 from uuid import UUID
 
@@ -39,6 +43,9 @@ from api.endpoints.models.endorse import (
 
 logger = logging.getLogger(__name__)
 
+# endorse requests sent to ACA-Py at the same time by endorse_transactions
+ENDORSE_CONCURRENCY = 10
+
 
 async def get_endorser_did() -> str:
     """Get the public DID from the endorser wallet."""
@@ -181,6 +188,54 @@ async def endorse_transaction(db: AsyncSession, txn: EndorseTransaction):
     return txn
 
 
+async def endorse_transactions(
+    db: AsyncSession, txns: list[EndorseTransaction]
+) -> list[EndorseTransaction]:
+    """Endorse several transactions and update their statuses in bulk.
+
+    The endorse calls to ACA-Py run concurrently, up to `ENDORSE_CONCURRENCY` at a
+    time, and the new states are written with one UPDATE per distinct state. A
+    transaction whose endorse call fails is logged and left as it was, so a later
+    pass can retry it. The caller is responsible for committing.
+
+    Returns:
+        list[EndorseTransaction]: The transactions that were endorsed.
+    """
+    semaphore = asyncio.Semaphore(ENDORSE_CONCURRENCY)
+
+    async def endorse(txn: EndorseTransaction) -> dict:
+        async with semaphore:
+            return cast(
+                dict, await au.acapy_POST(f"transactions/{txn.transaction_id}/endorse")
+            )
+
+    responses = await asyncio.gather(
+        *(endorse(txn) for txn in txns), return_exceptions=True
+    )
+
+    endorsed: list[EndorseTransaction] = []
+    ids_by_state: dict[str, list[UUID]] = defaultdict(list)
+    for txn, response in zip(txns, responses):
+        if isinstance(response, BaseException):
+            logger.error(
+                f"Failed to endorse transaction {txn.transaction_id}: {response}"
+            )
+            continue
+        ids_by_state[response["state"]].append(txn.transaction_id)
+        endorsed.append(txn)
+
+    for state, transaction_ids in ids_by_state.items():
+        q = (
+            update(EndorseRequest)
+            .where(EndorseRequest.transaction_id.in_(transaction_ids))
+            .values(state=state)
+        )
+        await db.execute(q)
+    logger.info(f">>> endorsed {len(endorsed)} of {len(txns)} endorser_requests")
+
+    return endorsed
+
+
 async def reject_transaction(db: AsyncSession, txn: EndorseTransaction):
     """Reject a transaction and update its status."""
     logger.info(f">>> called reject_transaction with: {txn.transaction_id}")
@@ -1,4 +1,37 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
 def pytest_configure(config):
     # Block ruff plugin to avoid requiring the ruff binary in CI/unit runs
     config.pluginmanager.set_blocked("ruff")
     config.pluginmanager.set_blocked("pytest_ruff")
+
+
+class CopyConnection:
+    """Session connection stub whose raw asyncpg connection records COPY calls."""
+
+    def __init__(self) -> None:
+        self.in_transaction = False
+        # for each COPY call, whether a transaction had been begun before it
+        self.copied_in_transaction: list[bool] = []
+        self.driver = MagicMock()
+        self.driver.is_in_transaction.side_effect = lambda: self.in_transaction
+        self.driver.copy_records_to_table = AsyncMock(side_effect=self._copy)
+        self.exec_driver_sql = AsyncMock(side_effect=self._begin)
+
+    async def _begin(self, statement: str) -> None:
+        self.in_transaction = True
+
+    async def _copy(self, table: str, **kwargs) -> None:
+        self.copied_in_transaction.append(self.in_transaction)
+
+    async def get_raw_connection(self) -> MagicMock:
+        return MagicMock(driver_connection=self.driver)
+
+
+@pytest.fixture
+def copy_connection() -> CopyConnection:
+    """Connection to hand out from a mocked session's `connection()` for COPY loads."""
+    return CopyConnection()
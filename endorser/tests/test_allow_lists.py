@@ -3,9 +3,26 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from api.db.errors import AlreadyExists
+from api.db.models.allow import (
+    AllowedCredentialDefinition,
+    AllowedPublicDid,
+    AllowedSchema,
+)
 from api.db.models.endorse_request import EndorseRequest
 from api.endpoints.models.endorse import EndorseTransactionState
-from api.services.allow_lists import updated_allowed
+from api.endpoints.routes.allow import get_allowed_cred_def
+from api.services import allow_lists
+from api.services.allow_lists import (
+    BATCH_COPY_THRESHOLD,
+    add_many_to_allow_list,
+    add_to_allow_list,
+    export_rows,
+    schedule_updated_allowed,
+    update_full_config,
+    updated_allowed,
+)
+from asyncpg.exceptions import UniqueViolationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -21,7 +38,7 @@ async def test_updated_allowed_no_pending_transactions():
     # Act
     with (
         patch("api.services.allow_lists.is_endorsable_transaction") as mock_is_endorsable,
-        patch("api.services.allow_lists.endorse_transaction") as mock_endorse,
+        patch("api.services.allow_lists.endorse_transactions") as mock_endorse,
     ):
         await updated_allowed(db)
 
@@ -58,7 +75,7 @@ async def test_updated_allowed_with_endorsable_transactions():
     # Act
     with (
         patch("api.services.allow_lists.is_endorsable_transaction") as mock_is_endorsable,
-        patch("api.services.allow_lists.endorse_transaction") as mock_endorse,
+        patch("api.services.allow_lists.endorse_transactions") as mock_endorse,
         patch("api.services.allow_lists.db_to_txn_object") as mock_db_to_txn,
     ):
         # Mock first transaction is endorsable, second is not
@@ -72,7 +89,7 @@ async def test_updated_allowed_with_endorsable_transactions():
     # Assert
     assert db.execute.call_count == 1
     assert mock_is_endorsable.call_count == 2
-    mock_endorse.assert_called_once_with(db, mock_txn_obj1)
+    mock_endorse.assert_called_once_with(db, [mock_txn_obj1])
     db.commit.assert_called_once()
 
 
@@ -93,7 +110,7 @@ async def test_updated_allowed_with_no_endorsable_transactions():
     # Act
     with (
         patch("api.services.allow_lists.is_endorsable_transaction") as mock_is_endorsable,
-        patch("api.services.allow_lists.endorse_transaction") as mock_endorse,
+        patch("api.services.allow_lists.endorse_transactions") as mock_endorse,
         patch("api.services.allow_lists.db_to_txn_object") as mock_db_to_txn,
     ):
         mock_is_endorsable.return_value = False
@@ -127,7 +144,7 @@ async def test_updated_allowed_commits_after_endorsements():
     # Act
     with (
         patch("api.services.allow_lists.is_endorsable_transaction") as mock_is_endorsable,
-        patch("api.services.allow_lists.endorse_transaction") as mock_endorse,
+        patch("api.services.allow_lists.endorse_transactions") as mock_endorse,
         patch("api.services.allow_lists.db_to_txn_object") as mock_db_to_txn,
     ):
         mock_is_endorsable.side_effect = [True, True]
@@ -138,7 +155,7 @@ async def test_updated_allowed_commits_after_endorsements():
         await updated_allowed(db)
 
     # Assert - verify commit is called AFTER endorsements
-    assert mock_endorse.call_count == 2
+    mock_endorse.assert_called_once_with(db, [mock_txn_obj1, mock_txn_obj2])
     db.commit.assert_called_once()
 
     # Verify order: endorse calls happen before commit
@@ -188,3 +205,268 @@ async def test_updated_allowed_queries_correct_state():
     # Assert - verify select and where were called
     mock_select.assert_called_once()
     db.execute.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_add_many_to_allow_list_single_insert():
+    """Test add_many_to_allow_list inserts every row in one statement."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    rows = [
+        {"author_did": "did:1", "schema_name": "s", "version": "1.0"},
+        {"author_did": "did:2", "schema_name": "s", "version": "1.0"},
+    ]
+
+    # Act
+    with patch("api.services.allow_lists.schedule_updated_allowed") as mock_updated:
+        count = await add_many_to_allow_list(db, AllowedSchema, rows)
+
+    # Assert
+    assert count == 2
+    db.execute.assert_called_once()
+    assert db.execute.call_args.args[1] == rows
+    db.commit.assert_called_once()
+    mock_updated.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_add_many_to_allow_list_copies_large_batches(copy_connection):
+    """Test a batch above the threshold is loaded with COPY, booleans unchanged."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    rows = [
+        {
+            "schema_issuer_did": "did:issuer",
+            "creddef_author_did": f"did:{n}",
+            "schema_name": "s",
+            "version": "1.0",
+            "tag": "default",
+            "rev_reg_def": True,
+            "rev_reg_entry": False,
+            "details": None,
+        }
+        for n in range(BATCH_COPY_THRESHOLD + 1)
+    ]
+    db.connection.return_value = copy_connection
+
+    # Act
+    with patch("api.services.allow_lists.schedule_updated_allowed") as mock_updated:
+        count = await add_many_to_allow_list(db, AllowedCredentialDefinition, rows)
+
+    # Assert
+    assert count == BATCH_COPY_THRESHOLD + 1
+    db.execute.assert_not_called()
+    assert copy_connection.copied_in_transaction == [True]
+    copy = copy_connection.driver.copy_records_to_table.call_args
+    assert copy.kwargs["columns"][-1] == "allowed_cred_def_id"
+    assert copy.kwargs["records"][0][5:7] == (True, False)
+    db.commit.assert_called_once()
+    mock_updated.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_add_many_to_allow_list_duplicate_in_later_chunk_rolls_back(
+    copy_connection,
+):
+    """Test a duplicate in a later COPY chunk rolls back the chunks before it."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    db.connection.return_value = copy_connection
+    rows = [
+        {"registered_did": f"did:{n}", "details": None}
+        for n in range(BATCH_COPY_THRESHOLD + 1)
+    ]
+    copy = copy_connection.driver.copy_records_to_table
+    copy.side_effect = [None, UniqueViolationError("duplicate key")]
+
+    # Act
+    with (
+        patch("api.services.allow_lists.BULK_COPY_CHUNK_SIZE", 100),
+        patch("api.services.allow_lists.schedule_updated_allowed") as mock_updated,
+        pytest.raises(AlreadyExists),
+    ):
+        await add_many_to_allow_list(db, AllowedPublicDid, rows)
+
+    # Assert
+    assert copy.await_count == 2
+    # the first chunk was copied in the session's transaction, then rolled back
+    copy_connection.exec_driver_sql.assert_awaited_once()
+    assert copy_connection.in_transaction
+    db.rollback.assert_awaited_once()
+    db.commit.assert_not_awaited()
+    mock_updated.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_add_many_to_allow_list_empty():
+    """Test add_many_to_allow_list does nothing for an empty batch."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+
+    # Act
+    with patch("api.services.allow_lists.schedule_updated_allowed") as mock_updated:
+        count = await add_many_to_allow_list(db, AllowedSchema, [])
+
+    # Assert
+    assert count == 0
+    db.execute.assert_not_called()
+    mock_updated.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_add_to_allow_list_returns_inserted_row():
+    """Test add_to_allow_list returns the row from INSERT ... RETURNING."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    stored = AllowedSchema(author_did="did:1", schema_name="s", version="1.0")
+    result_mock = MagicMock()
+    result_mock.scalar_one.return_value = stored
+    db.execute.return_value = result_mock
+    data = {"author_did": "did:1", "schema_name": "s", "version": "1.0"}
+
+    # Act
+    with patch("api.services.allow_lists.schedule_updated_allowed") as mock_updated:
+        result = await add_to_allow_list(db, AllowedSchema, data)
+
+    # Assert
+    assert result is stored
+    stmt = db.execute.call_args.args[0]
+    assert stmt.is_insert
+    assert stmt._returning
+    db.commit.assert_called_once()
+    mock_updated.assert_called_once_with()
+
+
+@pytest.mark.asyncio
+async def test_get_allowed_cred_def_does_not_reprocess_pending():
+    """Test listing credential definitions does not reprocess pending requests."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+
+    # Act
+    with (
+        patch(
+            "api.endpoints.routes.allow.select_from_table",
+            AsyncMock(return_value=(0, [], False, None)),
+        ),
+        patch("api.endpoints.routes.allow.allow_list_etag", AsyncMock(return_value=None)),
+        patch("api.endpoints.routes.allow.schedule_updated_allowed") as mock_updated,
+    ):
+        result = await get_allowed_cred_def(MagicMock(), MagicMock(), db=db)
+
+    # Assert
+    assert result.count == 0
+    mock_updated.assert_not_called()
+    db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_schedule_updated_allowed_coalesces_burst():
+    """Test a burst of scheduled refreshes runs updated_allowed once."""
+    # Arrange
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value="session")
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    # Act
+    with (
+        patch("api.services.allow_lists.REFRESH_DELAY", 0),
+        patch("api.services.allow_lists.async_session", session),
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
+    ):
+        for _ in range(5):
+            schedule_updated_allowed()
+        await allow_lists._pending_refresh
+        schedule_updated_allowed()
+        await allow_lists._pending_refresh
+
+    # Assert
+    assert mock_updated.await_count == 2
+    mock_updated.assert_awaited_with("session")
+
+
+@pytest.mark.asyncio
+async def test_schedule_updated_allowed_during_refresh_runs_another_pass():
+    """Test a change scheduled mid-refresh reruns the same task, not a second one."""
+    # Arrange
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value="session")
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+    tasks = []
+
+    async def change_during_first_pass(db):
+        if not tasks:
+            tasks.append(allow_lists._pending_refresh)
+            schedule_updated_allowed()
+            tasks.append(allow_lists._pending_refresh)
+
+    # Act
+    with (
+        patch("api.services.allow_lists.REFRESH_DELAY", 0),
+        patch("api.services.allow_lists.async_session", session),
+        patch(
+            "api.services.allow_lists.updated_allowed",
+            AsyncMock(side_effect=change_during_first_pass),
+        ) as mock_updated,
+    ):
+        schedule_updated_allowed()
+        await allow_lists._pending_refresh
+
+    # Assert
+    assert tasks[0] is tasks[1]
+    assert mock_updated.await_count == 2
+    assert allow_lists._pending_refresh is None
+
+
+@pytest.mark.asyncio
+async def test_update_full_config_reprocesses_under_refresh_lock():
+    """Test the upload's own pass over pending requests holds the refresh lock."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    upload = MagicMock(filename="dids.csv")
+    locked = []
+
+    async def record_lock(_db):
+        locked.append(allow_lists._refresh_lock.locked())
+
+    # Act
+    with (
+        patch("api.services.allow_lists.update_allowed_config", AsyncMock()),
+        patch(
+            "api.services.allow_lists.updated_allowed",
+            AsyncMock(side_effect=record_lock),
+        ),
+    ):
+        await update_full_config(None, upload, None, None, db, False)
+
+    # Assert
+    assert locked == [True]
+
+
+@pytest.mark.asyncio
+async def test_export_rows_yields_ndjson_per_batch():
+    """Test export_rows encodes each streamed batch as newline-delimited JSON."""
+
+    # Arrange
+    async def partitions():
+        yield [AllowedSchema(author_did="did:1", schema_name="s", version="1.0")]
+        yield [AllowedSchema(author_did="did:2", schema_name="s", version="2.0")]
+
+    result = MagicMock()
+    result.scalars.return_value.partitions = partitions
+    db = AsyncMock(spec=AsyncSession)
+    db.stream.return_value = result
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value=db)
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    # Act
+    with patch("api.services.allow_lists.async_session", session):
+        chunks = [chunk async for chunk in export_rows(AllowedSchema)]
+
+    # Assert
+    assert len(chunks) == 2
+    assert chunks[0].endswith(b"\n")
+    assert b'"author_did":"did:2"' in chunks[1]
+    stmt = db.stream.call_args.args[0]
+    assert stmt.get_execution_options()["yield_per"] == allow_lists.EXPORT_BATCH_SIZE
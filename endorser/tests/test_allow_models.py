@@ -1,11 +1,15 @@
 import uuid
 
 from api.db.models.allow import (
+    AllowedCredentialDefinition,
     AllowedLogEntry,
+    AllowedSchema,
     allowed_cred_def_uuid,
     allowed_log_entry_uuid,
     allowed_schema_uuid,
+    key_uuid,
 )
+from api.endpoints.models.allow import AllowedSchemaList
 
 
 class DummyContext:
@@ -69,3 +73,21 @@ def test_allowed_log_entry_default_log_updates_false():
         scid="scid", domain="d", namespace="n", identifier="id", version="1"
     )
     assert entry.log_updates is False
+
+
+def test_key_uuid_matches_column_defaults():
+    params = {"author_did": "did:a", "schema_name": "degree", "version": "1.0"}
+    key = AllowedSchema.__table__.c.allowed_schema_id.info["uuid5_key"]
+    assert key_uuid(*(params[name] for name in key)) == allowed_schema_uuid(
+        DummyContext(params)
+    )
+    assert AllowedCredentialDefinition.__table__.c.allowed_cred_def_id.info[
+        "uuid5_key"
+    ] == ("schema_issuer_did", "creddef_author_did", "schema_name", "version", "tag")
+
+
+def test_allowed_schema_list_keeps_row_instances():
+    # rows loaded from the database are passed through, not validated again
+    row = AllowedSchema(author_did="did:a", schema_name="degree", version="1.0")
+    page = AllowedSchemaList(page_size=1, page_num=1, count=1, schemas=[row])
+    assert page.schemas[0] is row
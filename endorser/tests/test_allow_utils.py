@@ -1,26 +1,35 @@
+import uuid
 from io import BytesIO
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from asyncpg.exceptions import UniqueViolationError
 from api.db.errors import AlreadyExists
-from api.db.models.allow import AllowedCredentialDefinition, AllowedLogEntry
-from api.endpoints.routes.allow import (
-    construct_allowed_credential_definition,
+from api.db.models.allow import (
+    AllowedCredentialDefinition,
+    AllowedLogEntry,
+    AllowedPublicDid,
+    AllowedSchema,
+)
+from api.services.allow_lists import (
+    BULK_COPY_THRESHOLD,
     db_to_http_exception,
-    maybe_str_to_bool,
     update_allowed_config,
+    update_full_config,
 )
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 
 class DummySession:
-    """Minimal async session stub capturing added objects."""
+    """Minimal async session stub capturing executed statements."""
 
     def __init__(self) -> None:
-        self.added: list[object] = []
+        self.executed: list[tuple[object, object]] = []
 
-    def add(self, obj: object) -> None:
-        self.added.append(obj)
+    async def execute(self, stmt: object, params: object = None) -> None:
+        self.executed.append((stmt, params))
 
 
 class DummyUploadFile:
@@ -35,32 +44,35 @@ def test_db_to_http_exception_mappings():
     dummy_err = IntegrityError(statement="", params="", orig=Exception())
     assert db_to_http_exception(dummy_err) == status.HTTP_409_CONFLICT
     assert db_to_http_exception(AlreadyExists()) == status.HTTP_409_CONFLICT
+    # duplicates in a CSV large enough for COPY surface straight from asyncpg
+    assert db_to_http_exception(UniqueViolationError()) == status.HTTP_409_CONFLICT
     assert db_to_http_exception(RuntimeError()) == status.HTTP_500_INTERNAL_SERVER_ERROR
 
 
-def test_maybe_str_to_bool_conversions():
-    assert maybe_str_to_bool("True") is True
-    assert maybe_str_to_bool("False") is False
-    assert maybe_str_to_bool(True) is True
-    assert maybe_str_to_bool(False) is False
-    assert maybe_str_to_bool("anything-else") is False
+def test_db_to_http_exception_maps_subclasses():
+    class DuplicateEntry(AlreadyExists):
+        pass
+
+    assert db_to_http_exception(DuplicateEntry()) == status.HTTP_409_CONFLICT
+
+
+@pytest.mark.asyncio
+async def test_update_allowed_config_reads_bool_spellings():
+    true_spellings = "True true TRUE 1 t T yes Yes YES y Y".split()
+    false_spellings = ["False", "no", "anything-else", ""]
+    spellings = true_spellings + false_spellings
+    rows = "".join(
+        f"scid-{n},example.com,ns,id-{n},{v}\n" for n, v in enumerate(spellings)
+    )
+    csv_content = ("scid,domain,namespace,identifier,log_updates\n" + rows).encode()
+    upload = DummyUploadFile("log_entries.csv", csv_content)
+    db = DummySession()
 
+    await update_allowed_config(upload, AllowedLogEntry, db)
 
-def test_construct_allowed_credential_definition_bool_conversion():
-    data = {
-        "schema_issuer_did": "did:peer:issuer",
-        "creddef_author_did": "did:peer:author",
-        "schema_name": "degree",
-        "version": "1.0",
-        "tag": "tag1",
-        "rev_reg_def": "True",
-        "rev_reg_entry": "False",
-        "details": None,
-    }
-    model = construct_allowed_credential_definition(data)
-    assert isinstance(model, AllowedCredentialDefinition)
-    assert model.rev_reg_def is True
-    assert model.rev_reg_entry is False
+    [(_, params)] = db.executed
+    expected = [True] * len(true_spellings) + [False] * len(false_spellings)
+    assert [p["log_updates"] for p in params] == expected
 
 
 @pytest.mark.asyncio
@@ -75,11 +87,12 @@ async def test_update_allowed_config_reads_csv_and_adds_models():
 
     result = await update_allowed_config(upload, AllowedLogEntry, db)
 
-    assert result["file_name"] == "log_entries.csv"
-    assert len(result["contents"]) == 2
-    assert all(isinstance(item, AllowedLogEntry) for item in result["contents"])
-    # ensure objects were added to the session stub
-    assert db.added == result["contents"]
+    assert result == {"file_name": "log_entries.csv", "count": 2}
+    # ensure both rows went out in a single insert on the table
+    [(stmt, params)] = db.executed
+    assert stmt.is_insert and stmt.table.name == "allowedlogentry"
+    assert [p["scid"] for p in params] == ["scid-1", "scid-2"]
+    assert [p["log_updates"] for p in params] == [True, False]
 
 
 @pytest.mark.asyncio
@@ -93,7 +106,152 @@ async def test_update_allowed_config_handles_creddef_bool_strings():
 
     result = await update_allowed_config(upload, AllowedCredentialDefinition, db)
 
-    model = result["contents"][0]
-    assert model.rev_reg_def is True
-    assert model.rev_reg_entry is False
-    assert db.added == result["contents"]
+    assert result["count"] == 1
+    [(_, [values])] = db.executed
+    assert values["rev_reg_def"] is True
+    assert values["rev_reg_entry"] is False
+
+
+@pytest.mark.asyncio
+async def test_update_allowed_config_copies_large_files(copy_connection):
+    rows = "".join(
+        f"did:example:{n},schema-{n},1.0,\n" for n in range(BULK_COPY_THRESHOLD + 1)
+    )
+    csv_content = ("author_did,schema_name,version,details\n" + rows).encode()
+    upload = DummyUploadFile("schemas.csv", csv_content)
+    db = DummySession()
+    db.connection = AsyncMock(return_value=copy_connection)
+
+    result = await update_allowed_config(upload, AllowedSchema, db)
+
+    assert result["count"] == BULK_COPY_THRESHOLD + 1
+    assert db.executed == []
+    assert copy_connection.copied_in_transaction == [True]
+    copy = copy_connection.driver.copy_records_to_table
+    copy.assert_awaited_once()
+    assert copy.call_args.args == ("allowedschema",)
+    columns = copy.call_args.kwargs["columns"]
+    assert columns == [
+        "author_did",
+        "schema_name",
+        "version",
+        "details",
+        "allowed_schema_id",
+    ]
+    first = copy.call_args.kwargs["records"][0]
+    assert first[:3] == ("did:example:0", "schema-0", "1.0")
+    assert first[4] == uuid.uuid5(uuid.NAMESPACE_OID, "did:example:0schema-01.0")
+
+
+@pytest.mark.asyncio
+async def test_update_allowed_config_copy_fills_missing_scalar_defaults(copy_connection):
+    rows = "".join(
+        f"scid-{n},example.com,ns,id-{n}\n" for n in range(BULK_COPY_THRESHOLD + 1)
+    )
+    csv_content = ("scid,domain,namespace,identifier\n" + rows).encode()
+    upload = DummyUploadFile("log_entries.csv", csv_content)
+    db = DummySession()
+    db.connection = AsyncMock(return_value=copy_connection)
+
+    await update_allowed_config(upload, AllowedLogEntry, db)
+
+    copy = copy_connection.driver.copy_records_to_table
+    columns = copy.call_args.kwargs["columns"]
+    assert columns[-2:] == ["allowed_log_entry_id", "log_updates"]
+    # COPY skips Core defaults, so log_updates is sent as it would be inserted
+    assert all(r[-1] is False for r in copy.call_args.kwargs["records"])
+
+
+@pytest.mark.asyncio
+async def test_update_allowed_config_copies_in_chunks(copy_connection):
+    rows = "".join(f"did:example:{n},\n" for n in range(BULK_COPY_THRESHOLD + 1))
+    upload = DummyUploadFile("dids.csv", ("registered_did,details\n" + rows).encode())
+    db = DummySession()
+    db.connection = AsyncMock(return_value=copy_connection)
+
+    with patch("api.services.allow_lists.BULK_COPY_CHUNK_SIZE", 40):
+        result = await update_allowed_config(upload, AllowedPublicDid, db)
+
+    assert result["count"] == BULK_COPY_THRESHOLD + 1
+    calls = copy_connection.driver.copy_records_to_table.call_args_list
+    assert [len(c.kwargs["records"]) for c in calls] == [40, 40, 21]
+    copied = [r[0] for c in calls for r in c.kwargs["records"]]
+    assert copied == [f"did:example:{n}" for n in range(BULK_COPY_THRESHOLD + 1)]
+
+
+@pytest.mark.asyncio
+async def test_update_full_config_copy_failure_rolls_back_earlier_chunks(
+    copy_connection,
+):
+    rows = "".join(f"did:example:{n},\n" for n in range(BULK_COPY_THRESHOLD + 1))
+    upload = DummyUploadFile("dids.csv", ("registered_did,details\n" + rows).encode())
+    db = AsyncMock(spec=AsyncSession)
+    db.connection.return_value = copy_connection
+    copy = copy_connection.driver.copy_records_to_table
+    copy.side_effect = [None, UniqueViolationError("duplicate key")]
+
+    with (
+        patch("api.services.allow_lists.BULK_COPY_CHUNK_SIZE", 40),
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
+        pytest.raises(UniqueViolationError),
+    ):
+        # append mode, so the COPY is the first statement of the transaction
+        await update_full_config(None, upload, None, None, db, False)
+
+    copy_connection.exec_driver_sql.assert_awaited_once()
+    assert copy.await_count == 2
+    # the first chunk went in inside the session's transaction, which is rolled
+    # back rather than committed
+    assert copy_connection.in_transaction
+    db.rollback.assert_awaited_once()
+    db.commit.assert_not_awaited()
+    mock_updated.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_update_allowed_config_rejects_ragged_rows():
+    csv_content = b"registered_did,details\ndid:example:1,info\ndid:example:2\n"
+    upload = DummyUploadFile("dids.csv", csv_content)
+    db = DummySession()
+
+    with pytest.raises(ValueError, match="same number of fields"):
+        await update_allowed_config(upload, AllowedPublicDid, db)
+    assert db.executed == []
+
+
+@pytest.mark.asyncio
+async def test_update_allowed_config_decodes_sized_upload_in_memory():
+    csv_content = "registered_did,details\ndid:example:1,café\n".encode()
+    upload = DummyUploadFile("dids.csv", csv_content)
+    upload.size = len(csv_content)
+    db = DummySession()
+
+    result = await update_allowed_config(upload, AllowedPublicDid, db)
+
+    assert result["count"] == 1
+    [(_, [values])] = db.executed
+    assert values == {"registered_did": "did:example:1", "details": "café"}
+
+
+@pytest.mark.asyncio
+async def test_update_allowed_config_leaves_streamed_upload_open():
+    upload = DummyUploadFile("dids.csv", b"registered_did,details\ndid:example:1,\n")
+    db = DummySession()
+
+    await update_allowed_config(upload, AllowedPublicDid, db)
+
+    assert not upload.file.closed
+
+
+@pytest.mark.asyncio
+async def test_update_allowed_config_computes_ids_for_small_files():
+    csv_content = b"author_did,schema_name,version,details\ndid:example:1,degree,1.0,\n"
+    upload = DummyUploadFile("schemas.csv", csv_content)
+    db = DummySession()
+
+    await update_allowed_config(upload, AllowedSchema, db)
+
+    [(_, [values])] = db.executed
+    assert values["allowed_schema_id"] == uuid.uuid5(
+        uuid.NAMESPACE_OID, "did:example:1degree1.0"
+    )
@@ -1,5 +1,6 @@
 """Unit tests for auto_state_handlers endorsement logic."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -9,6 +10,7 @@ from api.db.models.allow import (
     AllowedSchema,
 )
 from api.endpoints.models.endorse import EndorseTransaction, EndorseTransactionType
+from api.services import auto_state_handlers
 from api.services.auto_state_handlers import (
     CreddefCriteria,
     SchemaCriteria,
@@ -16,19 +18,25 @@ from api.services.auto_state_handlers import (
     allowed_publish_did,
     allowed_schema,
     check_auto_endorse,
+    allow_lookups_for_pass,
     is_endorsable_transaction,
+    prefetch_schema_ids,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+@pytest.fixture(autouse=True)
+def empty_schema_cache():
+    """Start each test without cached schema lookups."""
+    auto_state_handlers._schema_ids.clear()
+
+
 @pytest.mark.asyncio
 async def test_check_auto_endorse_found():
     """Test check_auto_endorse when a matching record is found."""
     # Arrange
     db = AsyncMock(spec=AsyncSession)
-    result_mock = MagicMock()
-    result_mock.one_or_none.return_value = MagicMock()  # Non-None means found
-    db.execute.return_value = result_mock
+    db.scalar.return_value = True
 
     # Act
     result = await check_auto_endorse(
@@ -39,7 +47,8 @@ async def test_check_auto_endorse_found():
 
     # Assert
     assert result is True
-    db.execute.assert_called_once()
+    db.scalar.assert_called_once()
+    assert "EXISTS" in str(db.scalar.call_args.args[0])
 
 
 @pytest.mark.asyncio
@@ -47,9 +56,7 @@ async def test_check_auto_endorse_not_found():
     """Test check_auto_endorse when no matching record is found."""
     # Arrange
     db = AsyncMock(spec=AsyncSession)
-    result_mock = MagicMock()
-    result_mock.one_or_none.return_value = None
-    db.execute.return_value = result_mock
+    db.scalar.return_value = False
 
     # Act
     result = await check_auto_endorse(
@@ -62,6 +69,48 @@ async def test_check_auto_endorse_not_found():
     assert result is False
 
 
+@pytest.mark.asyncio
+async def test_check_auto_endorse_reuses_statement_and_binds_values():
+    """Test lookups with the same columns share one statement and bind the values."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    db.scalar.return_value = False
+
+    # Act
+    for did in ("did:example:1", "did:example:2"):
+        await check_auto_endorse(
+            db, AllowedPublicDid, [(AllowedPublicDid.registered_did, did)]
+        )
+
+    # Assert
+    first, second = db.scalar.call_args_list
+    assert first.args[0] is second.args[0]
+    assert first.args[1] == {"registered_did": "did:example:1"}
+    assert second.args[1] == {"registered_did": "did:example:2"}
+
+
+@pytest.mark.asyncio
+async def test_check_auto_endorse_remembers_answers_only_within_a_pass():
+    """Test repeated lookups share one query inside a pass and none outside it."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    db.scalar.return_value = True
+    filters = [(AllowedPublicDid.registered_did, "did:example:123")]
+
+    # Act
+    with allow_lookups_for_pass():
+        first = await check_auto_endorse(db, AllowedPublicDid, filters)
+        second = await check_auto_endorse(db, AllowedPublicDid, filters)
+    # the entry was removed after the pass; the next lookup must see that
+    db.scalar.return_value = False
+    third = await check_auto_endorse(db, AllowedPublicDid, filters)
+    fourth = await check_auto_endorse(db, AllowedPublicDid, filters)
+
+    # Assert
+    assert (first, second, third, fourth) == (True, True, False, False)
+    assert db.scalar.call_count == 3
+
+
 @pytest.mark.asyncio
 async def test_allowed_publish_did():
     """Test allowed_publish_did calls check_auto_endorse correctly."""
@@ -264,6 +313,46 @@ async def test_is_endorsable_transaction_cred_def():
     assert creddef_criteria.Tag == "default"
 
 
+@pytest.mark.asyncio
+async def test_is_endorsable_transaction_revocation_branches_cached_apart():
+    """Test an allowed rev_reg_def lookup is not reused for a revocation entry."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    db.scalar.side_effect = [True, False]  # registry allowed, entries not
+
+    registry = MagicMock(spec=EndorseTransaction)
+    registry.author_goal_code = None
+    registry.transaction_type = EndorseTransactionType.revoc_registry
+    registry.author_did = "3w88pmVPfeVaz8bMukH2uR"
+    registry.transaction = {"credDefId": "3w88pmVPfeVaz8bMukH2uR:3:CL:12345:default"}
+
+    entry = MagicMock(spec=EndorseTransaction)
+    entry.author_goal_code = None
+    entry.transaction_type = EndorseTransactionType.revoc_entry
+    entry.author_did = "3w88pmVPfeVaz8bMukH2uR"
+    entry.transaction = {
+        "revocRegDefId": (
+            "3w88pmVPfeVaz8bMukH2uR:4:3w88pmVPfeVaz8bMukH2uR:3:CL:12345:default"
+            ":CL_ACCUM:default"
+        )
+    }
+
+    with patch(
+        "api.services.auto_state_handlers.au.acapy_GET",
+        AsyncMock(return_value={"schema": {"id": "did:2:TestSchema:1.0"}}),
+    ):
+        # Act
+        with allow_lookups_for_pass():
+            registry_allowed = await is_endorsable_transaction(db, registry)
+            entry_allowed = await is_endorsable_transaction(db, entry)
+
+    # Assert
+    assert (registry_allowed, entry_allowed) == (True, False)
+    assert db.scalar.call_count == 2
+    assert "rev_reg_def" in db.scalar.call_args_list[0].args[1]
+    assert "rev_reg_entry" in db.scalar.call_args_list[1].args[1]
+
+
 @pytest.mark.asyncio
 async def test_is_endorsable_transaction_missing_author_did():
     """Test is_endorsable_transaction returns False when author_did is missing."""
@@ -280,6 +369,9 @@ async def test_is_endorsable_transaction_missing_author_did():
 
     # Assert
     assert result is False
+    # rejected before any database lookup is scheduled
+    db.scalar.assert_not_awaited()
+    db.execute.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -298,6 +390,9 @@ async def test_is_endorsable_transaction_missing_transaction():
 
     # Assert
     assert result is False
+    # rejected before any database lookup is scheduled
+    db.scalar.assert_not_awaited()
+    db.execute.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -317,3 +412,88 @@ async def test_is_endorsable_transaction_unknown_type():
 
     # Assert
     assert result is False
+
+
+def cred_def_txn(ref):
+    transaction = MagicMock(spec=EndorseTransaction)
+    transaction.author_goal_code = None
+    transaction.transaction_type = EndorseTransactionType.cred_def
+    transaction.author_did = "did:example:author"
+    transaction.transaction = {"ref": ref, "tag": "default"}
+    return transaction
+
+
+@pytest.mark.asyncio
+async def test_prefetch_schema_ids_looks_up_each_schema_once():
+    """Test prefetching fetches each referenced schema once, then serves the cache."""
+    # Arrange
+    txns = [cred_def_txn(1), cred_def_txn(1), cred_def_txn(2)]
+    schemas = {
+        "schemas/1": {"schema": {"id": "did:2:One:1.0"}},
+        "schemas/2": {"schema": {"id": "did:2:Two:1.0"}},
+    }
+
+    with (
+        patch(
+            "api.services.auto_state_handlers.au.acapy_GET",
+            AsyncMock(side_effect=schemas.get),
+        ) as mock_acapy,
+        patch(
+            "api.services.auto_state_handlers.allowed_creddef", AsyncMock()
+        ) as mock_allowed,
+    ):
+        # Act
+        await prefetch_schema_ids(txns)
+        await is_endorsable_transaction(AsyncMock(spec=AsyncSession), txns[0])
+
+    # Assert
+    assert sorted(c.args[0] for c in mock_acapy.call_args_list) == [
+        "schemas/1",
+        "schemas/2",
+    ]
+    assert mock_allowed.call_args.args[1].Schema_Name == "One"
+
+
+@pytest.mark.asyncio
+async def test_is_endorsable_transaction_cred_def_string_ref_uses_prefetch():
+    """Test a cred_def whose ref is a string finds the schema the prefetch cached."""
+    # Arrange
+    txn = cred_def_txn("12345")
+    mock_acapy = AsyncMock(return_value={"schema": {"id": "did:2:One:1.0"}})
+
+    with (
+        patch("api.services.auto_state_handlers.au.acapy_GET", mock_acapy),
+        patch("api.services.auto_state_handlers.allowed_creddef", AsyncMock()),
+    ):
+        # Act
+        await prefetch_schema_ids([txn])
+        await is_endorsable_transaction(AsyncMock(spec=AsyncSession), txn)
+
+    # Assert
+    mock_acapy.assert_awaited_once_with("schemas/12345")
+
+
+@pytest.mark.asyncio
+async def test_prefetch_schema_ids_bounds_concurrent_lookups():
+    """Test prefetching keeps at most SCHEMA_PREFETCH_CONCURRENCY lookups in flight."""
+    # Arrange
+    in_flight = peak = 0
+
+    async def lookup(path):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return {"schema": {"id": f"did:2:{path}:1.0"}}
+
+    with (
+        patch("api.services.auto_state_handlers.au.acapy_GET", side_effect=lookup),
+        patch("api.services.auto_state_handlers.SCHEMA_PREFETCH_CONCURRENCY", 3),
+    ):
+        # Act
+        await prefetch_schema_ids([cred_def_txn(n) for n in range(10)])
+
+    # Assert
+    assert peak == 3
+    assert len(auto_state_handlers._schema_ids) == 10
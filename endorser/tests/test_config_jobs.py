@@ -0,0 +1,72 @@
+"""Unit tests for background configuration uploads."""
+
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from api.endpoints.models.allow import ConfigJob, ConfigJobState
+from api.services.config_jobs import get_config_job, run_config_job, start_config_job
+from fastapi import BackgroundTasks, HTTPException, UploadFile
+
+
+@pytest.mark.asyncio
+async def test_start_config_job_spools_upload_and_queues_task():
+    """Test start_config_job copies the upload and queues the job."""
+    # Arrange
+    background_tasks = BackgroundTasks()
+    upload = UploadFile(filename="publish_did.csv", file=BytesIO(b"registered_did\nx"))
+
+    # Act
+    job = await start_config_job(background_tasks, None, upload, None, None, True)
+
+    # Assert
+    assert job.state == ConfigJobState.pending
+    assert get_config_job(job.job_id) is job
+    task = background_tasks.tasks[0]
+    assert task.func is run_config_job
+    _, uploads, delete_contents = task.args
+    assert delete_contents is True
+    assert uploads[0] is None
+    assert uploads[1] is not upload
+    assert uploads[1].filename == "publish_did.csv"
+    assert uploads[1].file.read() == b"registered_did\nx"
+
+
+@pytest.mark.asyncio
+async def test_start_config_job_rejects_no_files():
+    """Test start_config_job raises 400 without queuing when no files are given."""
+    background_tasks = BackgroundTasks()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await start_config_job(background_tasks, None, None, None, None, False)
+
+    assert exc_info.value.status_code == 400
+    assert not background_tasks.tasks
+
+
+@pytest.mark.asyncio
+async def test_run_config_job_records_result_and_failure():
+    """Test run_config_job stores the result, or the error if the upload fails."""
+    # Arrange
+    upload = MagicMock()
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock()
+    session.return_value.__aexit__ = AsyncMock(return_value=False)
+    ok, failed = ConfigJob(job_id="ok"), ConfigJob(job_id="failed")
+
+    # Act
+    with (
+        patch("api.services.config_jobs.async_session", session),
+        patch("api.services.config_jobs.update_full_config") as mock_update,
+    ):
+        mock_update.return_value = {"AllowedPublicDid": {"count": 1}}
+        await run_config_job(ok, [None, upload, None, None], True)
+        mock_update.side_effect = RuntimeError("boom")
+        await run_config_job(failed, [None, upload, None, None], True)
+
+    # Assert
+    assert ok.state == ConfigJobState.completed
+    assert ok.result == {"AllowedPublicDid": {"count": 1}}
+    assert failed.state == ConfigJobState.failed
+    assert failed.error == "boom"
+    assert upload.file.close.call_count == 2
@@ -1,2 +1,37 @@
+from api.main import ExportAwareGZipMiddleware
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+
+ROWS = ['{"registered_did": "did:example:%d"}\n' % n for n in range(200)]
+
+
+def compressing_app() -> FastAPI:
+    app = FastAPI(middleware=[Middleware(ExportAwareGZipMiddleware, minimum_size=1024)])
+
+    @app.get("/allow/publish-did")
+    def page():
+        return {"dids": ROWS}
+
+    @app.get("/allow/publish-did/export")
+    def export():
+        return StreamingResponse(iter(ROWS), media_type="application/x-ndjson")
+
+    return app
+
+
 def test_main():
     assert True
+
+
+def test_gzip_compresses_pages_but_not_exports():
+    client = TestClient(compressing_app())
+    headers = {"Accept-Encoding": "gzip"}
+
+    page = client.get("/allow/publish-did", headers=headers)
+    export = client.get("/allow/publish-did/export", headers=headers)
+
+    assert page.headers["content-encoding"] == "gzip"
+    assert "content-encoding" not in export.headers
+    assert export.text == "".join(ROWS)
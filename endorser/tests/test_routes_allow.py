@@ -1,11 +1,22 @@
-"""Unit tests for allow routes, specifically update_full_config functionality."""
+"""Unit tests for allow routes and the update_full_config upload handling."""
 
+import uuid
+from collections import namedtuple
 from io import BytesIO
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from api.endpoints.routes.allow import update_full_config
-from fastapi import HTTPException, UploadFile
+from api.db.errors import AlreadyExists
+from api.db.models.allow import AllowedCredentialDefinition, AllowedPublicDid
+from api.endpoints.routes.allow import (
+    db_errors,
+    delete_allowed_schema,
+    get_allowed_dids,
+    router,
+    select_from_table,
+)
+from api.services.allow_lists import update_full_config
+from fastapi import HTTPException, Response, UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
@@ -15,6 +26,21 @@ def create_mock_upload_file(filename: str, content: str) -> UploadFile:
     return UploadFile(filename=filename, file=file_like)
 
 
+ALLOW_TABLES = (
+    "allowedlogentry",
+    "allowedpublicdid",
+    "allowedschema",
+    "allowedcredentialdefinition",
+)
+
+
+def create_mock_session(filled: tuple[str, ...] = ALLOW_TABLES) -> AsyncMock:
+    """Create a mock session in which the `filled` tables hold rows."""
+    db = AsyncMock(spec=AsyncSession)
+    db.scalars.return_value = MagicMock(all=MagicMock(return_value=list(filled)))
+    return db
+
+
 @pytest.mark.asyncio
 async def test_update_full_config_rejects_no_files():
     """Test that update_full_config raises 400 when no files are provided."""
@@ -40,14 +66,14 @@ async def test_update_full_config_rejects_no_files():
 async def test_update_full_config_single_file_replace():
     """Test uploading a single config file in replace mode."""
     # Arrange
-    db = AsyncMock(spec=AsyncSession)
+    db = create_mock_session()
     csv_content = "registered_did,details\ndid:example:123,test"
     publish_did_file = create_mock_upload_file("publish_did.csv", csv_content)
 
     # Act
     with (
-        patch("api.endpoints.routes.allow.update_allowed_config") as mock_update,
-        patch("api.endpoints.routes.allow.updated_allowed") as mock_updated,
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
     ):
         mock_update.return_value = {"added": 1}
 
@@ -63,6 +89,7 @@ async def test_update_full_config_single_file_replace():
     # Assert
     assert "AllowedPublicDid" in result
     db.execute.assert_called_once()  # Only delete for AllowedPublicDid
+    assert str(db.execute.call_args.args[0]) == "TRUNCATE TABLE allowedpublicdid"
     mock_update.assert_called_once()
     db.commit.assert_called_once()
     mock_updated.assert_called_once_with(db)
@@ -72,7 +99,7 @@ async def test_update_full_config_single_file_replace():
 async def test_update_full_config_multiple_files_replace():
     """Test uploading multiple config files in replace mode."""
     # Arrange
-    db = AsyncMock(spec=AsyncSession)
+    db = create_mock_session()
 
     did_content = "registered_did,details\ndid:example:123,test"
     schema_content = (
@@ -84,8 +111,8 @@ async def test_update_full_config_multiple_files_replace():
 
     # Act
     with (
-        patch("api.endpoints.routes.allow.update_allowed_config") as mock_update,
-        patch("api.endpoints.routes.allow.updated_allowed") as mock_updated,
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
     ):
         mock_update.side_effect = [{"added": 1}, {"added": 1}]
 
@@ -101,12 +128,83 @@ async def test_update_full_config_multiple_files_replace():
     # Assert
     assert "AllowedPublicDid" in result
     assert "AllowedSchema" in result
-    assert db.execute.call_count == 2  # Delete for both tables
+    db.execute.assert_called_once()  # one TRUNCATE for both tables
+    assert (
+        str(db.execute.call_args.args[0])
+        == "TRUNCATE TABLE allowedpublicdid, allowedschema"
+    )
     assert mock_update.call_count == 2
     db.commit.assert_called_once()
     mock_updated.assert_called_once_with(db)
 
 
+@pytest.mark.asyncio
+async def test_update_full_config_replace_skips_empty_tables():
+    """Test that replace mode only truncates tables that already hold rows."""
+    # Arrange
+    db = create_mock_session(filled=("allowedschema",))
+
+    did_content = "registered_did,details\ndid:example:123,test"
+    schema_content = (
+        "author_did,schema_name,version,details\ndid:example:456,TestSchema,1.0,note"
+    )
+    publish_did_file = create_mock_upload_file("publish_did.csv", did_content)
+    schema_file = create_mock_upload_file("schema.csv", schema_content)
+
+    # Act
+    with (
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed"),
+    ):
+        mock_update.side_effect = [{"added": 1}, {"added": 1}]
+
+        await update_full_config(
+            log_entry=None,
+            publish_did=publish_did_file,
+            schema=schema_file,
+            credential_definition=None,
+            db=db,
+            delete_contents=True,
+        )
+
+    # Assert
+    db.scalars.assert_called_once()  # one probe for both tables
+    assert "UNION ALL" in str(db.scalars.call_args.args[0])
+    db.execute.assert_called_once()
+    assert str(db.execute.call_args.args[0]) == "TRUNCATE TABLE allowedschema"
+
+
+@pytest.mark.asyncio
+async def test_update_full_config_replace_empty_table_skips_truncate():
+    """Test that replace mode issues no TRUNCATE when the table is empty."""
+    # Arrange
+    db = create_mock_session(filled=())
+    csv_content = "registered_did,details\ndid:example:123,test"
+    publish_did_file = create_mock_upload_file("publish_did.csv", csv_content)
+
+    # Act
+    with (
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed"),
+    ):
+        mock_update.return_value = {"added": 1}
+
+        await update_full_config(
+            log_entry=None,
+            publish_did=publish_did_file,
+            schema=None,
+            credential_definition=None,
+            db=db,
+            delete_contents=True,
+        )
+
+    # Assert
+    db.scalars.assert_called_once()
+    db.execute.assert_not_called()
+    mock_update.assert_called_once()
+    db.commit.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_update_full_config_single_file_append():
     """Test uploading a single config file in append mode."""
@@ -117,8 +215,8 @@ async def test_update_full_config_single_file_append():
 
     # Act
     with (
-        patch("api.endpoints.routes.allow.update_allowed_config") as mock_update,
-        patch("api.endpoints.routes.allow.updated_allowed") as mock_updated,
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
     ):
         mock_update.return_value = {"added": 1}
 
@@ -143,7 +241,7 @@ async def test_update_full_config_single_file_append():
 async def test_update_full_config_all_files_replace():
     """Test uploading all four config files in replace mode."""
     # Arrange
-    db = AsyncMock(spec=AsyncSession)
+    db = create_mock_session()
 
     log_entry_content = (
         "scid,domain,namespace,identifier,log_updates\ntest_scid,test.com,ns,id1,true"
@@ -161,8 +259,8 @@ async def test_update_full_config_all_files_replace():
 
     # Act
     with (
-        patch("api.endpoints.routes.allow.update_allowed_config") as mock_update,
-        patch("api.endpoints.routes.allow.updated_allowed") as mock_updated,
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
     ):
         mock_update.side_effect = [
             {"added": 1},
@@ -186,7 +284,11 @@ async def test_update_full_config_all_files_replace():
     assert "AllowedPublicDid" in result
     assert "AllowedSchema" in result
     assert "AllowedCredentialDefinition" in result
-    assert db.execute.call_count == 4  # Delete for all tables
+    db.execute.assert_called_once()  # one TRUNCATE for all tables
+    assert str(db.execute.call_args.args[0]) == (
+        "TRUNCATE TABLE allowedlogentry, allowedpublicdid, allowedschema, "
+        "allowedcredentialdefinition"
+    )
     assert mock_update.call_count == 4
     db.commit.assert_called_once()
     mock_updated.assert_called_once_with(db)
@@ -196,14 +298,14 @@ async def test_update_full_config_all_files_replace():
 async def test_update_full_config_calls_updated_allowed():
     """Test that update_full_config calls updated_allowed to reprocess pending transactions."""
     # Arrange
-    db = AsyncMock(spec=AsyncSession)
+    db = create_mock_session()
     csv_content = "registered_did,details\ndid:example:123,test"
     publish_did_file = create_mock_upload_file("publish_did.csv", csv_content)
 
     # Act
     with (
-        patch("api.endpoints.routes.allow.update_allowed_config") as mock_update,
-        patch("api.endpoints.routes.allow.updated_allowed") as mock_updated,
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
     ):
         mock_update.return_value = {"added": 1}
 
@@ -232,7 +334,7 @@ async def test_update_full_config_calls_updated_allowed():
 async def test_update_full_config_only_deletes_provided_tables():
     """Test that only tables for provided files are deleted in replace mode."""
     # Arrange
-    db = AsyncMock(spec=AsyncSession)
+    db = create_mock_session()
 
     # Only provide schema file
     schema_content = "author_did,schema_name,version,details\n*,*,*,allow all"
@@ -240,8 +342,8 @@ async def test_update_full_config_only_deletes_provided_tables():
 
     # Act
     with (
-        patch("api.endpoints.routes.allow.update_allowed_config") as mock_update,
-        patch("api.endpoints.routes.allow.updated_allowed") as mock_updated,
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
     ):
         mock_update.return_value = {"added": 1}
 
@@ -263,7 +365,7 @@ async def test_update_full_config_only_deletes_provided_tables():
 async def test_update_full_config_mixed_files():
     """Test uploading a subset of files (log_entry and credential_definition)."""
     # Arrange
-    db = AsyncMock(spec=AsyncSession)
+    db = create_mock_session()
 
     log_entry_content = (
         "scid,domain,namespace,identifier,log_updates\ntest_scid,test.com,ns,id1,false"
@@ -275,8 +377,8 @@ async def test_update_full_config_mixed_files():
 
     # Act
     with (
-        patch("api.endpoints.routes.allow.update_allowed_config") as mock_update,
-        patch("api.endpoints.routes.allow.updated_allowed") as mock_updated,
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
     ):
         mock_update.side_effect = [{"added": 1}, {"added": 1}]
 
@@ -295,21 +397,25 @@ async def test_update_full_config_mixed_files():
     assert "AllowedCredentialDefinition" in result
     assert "AllowedPublicDid" not in result
     assert "AllowedSchema" not in result
-    assert db.execute.call_count == 2
+    db.execute.assert_called_once()
+    assert (
+        str(db.execute.call_args.args[0])
+        == "TRUNCATE TABLE allowedlogentry, allowedcredentialdefinition"
+    )
 
 
 @pytest.mark.asyncio
 async def test_update_full_config_rolls_back_on_error():
     """Test that update_full_config rolls back transaction if processing fails."""
     # Arrange
-    db = AsyncMock(spec=AsyncSession)
+    db = create_mock_session()
     csv_content = "registered_did,details\ndid:example:123,test"
     publish_did_file = create_mock_upload_file("publish_did.csv", csv_content)
 
     # Act & Assert
     with (
-        patch("api.endpoints.routes.allow.update_allowed_config") as mock_update,
-        patch("api.endpoints.routes.allow.updated_allowed") as mock_updated,
+        patch("api.services.allow_lists.update_allowed_config") as mock_update,
+        patch("api.services.allow_lists.updated_allowed") as mock_updated,
     ):
         # Make update_allowed_config fail
         mock_update.side_effect = Exception("Processing failed")
@@ -328,3 +434,273 @@ async def test_update_full_config_rolls_back_on_error():
         db.rollback.assert_called_once()
         db.commit.assert_not_called()
         mock_updated.assert_not_called()  # Should not reprocess if commit failed
+
+
+@pytest.mark.asyncio
+async def test_select_from_table_keyset_page():
+    """Test that a cursor seeks past the key instead of using OFFSET."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    Row = namedtuple("Row", ["item", "total_count"])
+    rows = [Row("did:0", 2), Row("did:1", 2)]
+    db.execute.return_value.all = MagicMock(return_value=rows)
+
+    # Act
+    total_count, page, has_more, _ = await select_from_table(
+        db,
+        [(AllowedPublicDid.registered_did, None)],
+        AllowedPublicDid,
+        page_num=5,
+        page_size=2,
+        key=AllowedPublicDid.registered_did,
+        after="did:example:1",
+    )
+
+    # Assert
+    sql = str(db.execute.call_args.args[0])
+    assert "allowedpublicdid.registered_did > :registered_did_1" in sql
+    assert "ORDER BY allowedpublicdid.registered_did" in sql
+    assert "OFFSET" not in sql
+    stmt = db.execute.call_args.args[0]
+    assert "LIMIT 3" in str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    assert total_count == 2
+    assert page == ["did:0", "did:1"]
+    assert has_more is False
+
+
+def test_publish_did_batch_route_precedes_did_route():
+    """Test POST /publish-did/batch is matched before POST /publish-did/{did}."""
+    paths = [route.path for route in router.routes if "POST" in route.methods]
+    assert paths.index("/publish-did/batch") < paths.index("/publish-did/{did}")
+
+
+@pytest.mark.asyncio
+async def test_select_from_table_single_round_trip():
+    """Test that a page and its total come from one windowed query."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    Row = namedtuple("Row", ["item", "total_count"])
+    db.execute.return_value.all = MagicMock(return_value=[Row("did:0", 7)])
+
+    # Act
+    total_count, page, has_more, _ = await select_from_table(
+        db, [], AllowedPublicDid, page_num=1, page_size=10
+    )
+
+    # Assert
+    db.execute.assert_awaited_once()
+    assert "count(*) OVER ()" in str(db.execute.call_args.args[0])
+    assert total_count == 7
+    assert page == ["did:0"]
+
+
+@pytest.mark.asyncio
+async def test_select_from_table_counts_past_last_page():
+    """Test that an empty page past the end still reports the total."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value.all = MagicMock(return_value=[])
+    db.execute.return_value.scalar_one = MagicMock(return_value=7)
+
+    # Act
+    total_count, page, has_more, _ = await select_from_table(
+        db, [], AllowedPublicDid, page_num=3, page_size=10
+    )
+
+    # Assert
+    assert db.execute.await_count == 2
+    assert total_count == 7
+    assert page == []
+
+
+@pytest.mark.asyncio
+async def test_select_from_table_has_more_without_total():
+    """Test that the extra row signals another page and no count is computed."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    Row = namedtuple("Row", ["item"])
+    db.execute.return_value.all = MagicMock(
+        return_value=[Row("did:0"), Row("did:1"), Row("did:2")]
+    )
+
+    # Act
+    total_count, page, has_more, _ = await select_from_table(
+        db,
+        [],
+        AllowedPublicDid,
+        page_num=1,
+        page_size=2,
+        key=AllowedPublicDid.registered_did,
+        include_total=False,
+    )
+
+    # Assert
+    assert "OVER" not in str(db.execute.call_args.args[0])
+    assert total_count is None
+    assert page == ["did:0", "did:1"]
+    assert has_more is True
+
+
+@pytest.mark.asyncio
+async def test_select_from_table_keeps_falsy_and_repeated_filters():
+    """Test that False and repeated filter values each add a condition."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value.all = MagicMock(return_value=[])
+
+    # Act
+    await select_from_table(
+        db,
+        [
+            (AllowedCredentialDefinition.rev_reg_def, False),
+            (AllowedCredentialDefinition.schema_name, "1.0"),
+            (AllowedCredentialDefinition.version, "1.0"),
+            (AllowedCredentialDefinition.tag, None),
+        ],
+        AllowedCredentialDefinition,
+        page_num=1,
+        page_size=10,
+    )
+
+    # Assert
+    sql = str(db.execute.call_args.args[0])
+    assert "allowedcredentialdefinition.rev_reg_def = false" in sql
+    assert "allowedcredentialdefinition.schema_name = :schema_name_1" in sql
+    assert "allowedcredentialdefinition.version = :version_1" in sql
+    assert "allowedcredentialdefinition.tag =" not in sql
+
+
+def mock_request(query: dict, headers: dict) -> MagicMock:
+    """Create a request stub carrying query parameters and headers."""
+    request = MagicMock()
+    request.query_params.multi_items.return_value = list(query.items())
+    request.headers = headers
+    return request
+
+
+@pytest.mark.asyncio
+async def test_get_allowed_dids_sets_version_etag():
+    """Test a list response carries an ETag built from the table version."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=7))
+    response = Response()
+
+    # Act
+    with patch(
+        "api.endpoints.routes.allow.select_from_table",
+        AsyncMock(return_value=(0, [], False, None)),
+    ):
+        result = await get_allowed_dids(
+            mock_request({"page_size": "5"}, {}), response, page_size=5, db=db
+        )
+
+    # Assert
+    assert result.count == 0
+    assert response.headers["ETag"].startswith('W/"allowedpublicdid-7-')
+    assert response.headers["Cache-Control"] == "private, must-revalidate"
+
+
+@pytest.mark.asyncio
+async def test_get_allowed_dids_reads_version_with_the_page():
+    """Test an unconditional list request reads the version in the page query."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    response = Response()
+    did = AllowedPublicDid(registered_did="did:example:1")
+
+    # Act
+    with patch(
+        "api.endpoints.routes.allow.select_from_table",
+        AsyncMock(return_value=(1, [did], False, 9)),
+    ) as mock_select:
+        await get_allowed_dids(mock_request({}, {}), response, db=db)
+
+    # Assert
+    assert mock_select.call_args.kwargs["with_version"] is True
+    db.execute.assert_not_awaited()  # no separate version round-trip
+    assert response.headers["ETag"].startswith('W/"allowedpublicdid-9-')
+
+
+@pytest.mark.asyncio
+async def test_select_from_table_reads_version_in_same_query():
+    """Test the table version comes back as a column of the page query."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    Row = namedtuple("Row", ["item", "total_count", "table_version"])
+    db.execute.return_value.all = MagicMock(return_value=[Row("did:0", 1, 4)])
+
+    # Act
+    total_count, page, has_more, version = await select_from_table(
+        db, [], AllowedPublicDid, page_num=1, page_size=10, with_version=True
+    )
+
+    # Assert
+    db.execute.assert_awaited_once()
+    assert "allowlistversion" in str(db.execute.call_args.args[0])
+    assert (total_count, page, version) == (1, ["did:0"], 4)
+
+
+@pytest.mark.asyncio
+async def test_get_allowed_dids_not_modified_skips_query():
+    """Test a matching If-None-Match returns 304 without listing the table."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    db.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=7))
+    response = Response()
+    with patch(
+        "api.endpoints.routes.allow.select_from_table",
+        AsyncMock(return_value=(0, [], False, None)),
+    ):
+        await get_allowed_dids(mock_request({}, {}), response, db=db)
+    etag = response.headers["ETag"]
+
+    # Act
+    with patch("api.endpoints.routes.allow.select_from_table") as mock_select:
+        result = await get_allowed_dids(
+            mock_request({}, {"if-none-match": etag}), Response(), db=db
+        )
+
+    # Assert
+    assert result.status_code == 304
+    assert result.headers["ETag"] == etag
+    mock_select.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_db_errors_maps_exceptions_and_keeps_http_errors():
+    """Test db_errors converts other errors but lets HTTPException through."""
+
+    # Arrange
+    @db_errors
+    async def endpoint(error: Exception) -> None:
+        raise error
+
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        await endpoint(AlreadyExists("duplicate"))
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.detail == "duplicate"
+
+    with pytest.raises(HTTPException) as exc_info:
+        await endpoint(HTTPException(status_code=404, detail="missing"))
+    assert exc_info.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_allowed_schema_binds_prebuilt_statement():
+    """Test deleting a schema reuses the module-level statement with bound id."""
+    # Arrange
+    db = AsyncMock(spec=AsyncSession)
+    schema_id = uuid.uuid4()
+
+    # Act
+    with patch("api.endpoints.routes.allow.schedule_updated_allowed") as mock_updated:
+        await delete_allowed_schema(schema_id, db=db)
+
+    # Assert
+    stmt, params = db.execute.call_args.args
+    assert stmt.is_delete and stmt.table.name == "allowedschema"
+    assert params == {"id": schema_id}
+    db.commit.assert_called_once()
+    mock_updated.assert_called_once_with()
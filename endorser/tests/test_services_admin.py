@@ -0,0 +1,76 @@
+"""Unit tests for the cached endorser configuration reads."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+from api.endpoints.dependencies.db import get_db
+from api.endpoints.dependencies.jwt_security import check_access_token
+from api.endpoints.models.configurations import (
+    Configuration,
+    ConfigurationSource,
+    ConfigurationType,
+)
+from api.endpoints.routes import admin as admin_routes
+from api.services import admin as svc
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+CONFIG = Configuration(
+    config_name=ConfigurationType.ENDORSER_AUTO_ACCEPT_CONNECTIONS,
+    config_value="false",
+    config_source=ConfigurationSource.Environment,
+)
+
+
+@pytest.fixture(autouse=True)
+def sources(monkeypatch):
+    svc.invalidate_endorser_configs()
+    acapy_get = AsyncMock(return_value={"config": {}, "result": None})
+    get_records = AsyncMock(return_value=[CONFIG])
+    monkeypatch.setattr(svc.au, "acapy_GET", acapy_get)
+    monkeypatch.setattr(svc, "get_config_records", get_records)
+    yield acapy_get, get_records
+    svc.invalidate_endorser_configs()
+
+
+@pytest.mark.asyncio
+async def test_get_endorser_configs_served_from_snapshot(sources):
+    acapy_get, get_records = sources
+
+    first = await svc.get_endorser_configs(db=None)
+    second = await svc.get_endorser_configs(db=None)
+    by_name = await svc.get_endorser_config(None, CONFIG.config_name.name)
+
+    assert second is first
+    assert by_name is CONFIG
+    assert acapy_get.await_count == 3
+    get_records.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_update_endorser_config_invalidates_snapshot(sources, monkeypatch):
+    _, get_records = sources
+    monkeypatch.setattr(svc, "update_config_record", AsyncMock(return_value=CONFIG))
+
+    await svc.get_endorser_configs(db=None)
+    await svc.update_endorser_config(None, CONFIG.config_name.name, "true")
+    await svc.get_endorser_configs(db=None)
+
+    assert get_records.await_count == 2
+
+
+def test_get_config_honours_if_none_match():
+    app = FastAPI()
+    app.include_router(admin_routes.router)
+    app.dependency_overrides[check_access_token] = lambda: None
+    app.dependency_overrides[get_db] = lambda: None
+    client = TestClient(app)
+
+    first = client.get("/config")
+    etag = first.headers["ETag"]
+    second = client.get("/config", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+    assert second.content == b""
@@ -36,6 +36,7 @@ async def test_get_config_record_from_db(monkeypatch):
 async def test_get_config_record_env_fallback(monkeypatch):
     env_key = "ENDORSER_REJECT_BY_DEFAULT"
     os.environ[env_key] = "true"
+    svc.refresh_env_snapshot()
 
     async def fake_fetch(db, name):
         raise DoesNotExist("missing")
@@ -48,6 +49,7 @@ async def test_get_config_record_env_fallback(monkeypatch):
     assert cfg.config_source is ConfigurationSource.Environment
 
     os.environ.pop(env_key, None)
+    svc.refresh_env_snapshot()
 
 
 @pytest.mark.asyncio
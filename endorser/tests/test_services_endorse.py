@@ -0,0 +1,29 @@
+"""Unit tests for endorsing transactions in bulk."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from api.services import endorse as svc
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@pytest.mark.asyncio
+async def test_endorse_transactions_updates_states_in_bulk(monkeypatch):
+    db = AsyncMock(spec=AsyncSession)
+    txns = [MagicMock(transaction_id=f"txn-{n}") for n in range(3)]
+
+    async def fake_post(path):
+        if path == "transactions/txn-1/endorse":
+            raise RuntimeError("acapy unavailable")
+        return {"state": "transaction_endorsed"}
+
+    monkeypatch.setattr(svc.au, "acapy_POST", fake_post)
+
+    endorsed = await svc.endorse_transactions(db, txns)
+
+    assert endorsed == [txns[0], txns[2]]
+    db.execute.assert_awaited_once()
+    stmt = db.execute.call_args.args[0]
+    assert stmt.is_update
+    assert stmt.compile().params["transaction_id_1"] == ["txn-0", "txn-2"]
+    db.commit.assert_not_called()